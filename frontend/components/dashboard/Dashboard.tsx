@@ -17,7 +17,7 @@ interface Props {
 }
 
 export default function Dashboard({ data }: Props) {
-  const { items, categories, metadata } = data;
+  const { items, categories, metadata, facets } = data;
 
   // Filter state
   const [activeCategory, setActiveCategory] = useState("all");
@@ -71,6 +71,14 @@ export default function Dashboard({ data }: Props) {
     return base;
   }, [isSearchMode, searchResult, items, activeCategory, typeFilter]);
 
+  // Tool-type counts from the facets over the homepage items (not the
+  // catalogue totals in metadata), narrowed by category
+  const typeCounts = useMemo(() => {
+    if (!facets || isSearchMode) return undefined;
+    if (activeCategory === "all") return facets.tool_type;
+    return facets.category_tool_type[activeCategory] ?? {};
+  }, [facets, isSearchMode, activeCategory]);
+
   const trendingItems = useMemo(
     () => items.filter((item) => item.trending_score !== null).slice(0, 12),
     [items]
@@ -129,6 +137,7 @@ export default function Dashboard({ data }: Props) {
         <div className="mt-6 space-y-3">
           <ToolTypeFilter
             items={items}
+            counts={typeCounts}
             active={typeFilter}
             onChange={setTypeFilter}
           />
@@ -6,6 +6,8 @@ export type ToolTypeValue = "all" | "app" | "library" | "model";
 
 interface Props {
   items: ToolItem[];
+  /** Precomputed tool_type counts; counted from `items` when absent. */
+  counts?: Record<string, number>;
   active: ToolTypeValue;
   onChange: (value: ToolTypeValue) => void;
 }
@@ -17,13 +19,20 @@ const OPTIONS: { value: ToolTypeValue; label: string }[] = [
   { value: "model",   label: "Models"     },
 ];
 
-export default function ToolTypeFilter({ items, active, onChange }: Props) {
-  const counts: Record<ToolTypeValue, number> = {
-    all:     items.length,
-    app:     items.filter((i) => i.tool_type === "app").length,
-    library: items.filter((i) => i.tool_type === "library").length,
-    model:   items.filter((i) => i.tool_type === "model").length,
-  };
+export default function ToolTypeFilter({ items, counts: precomputed, active, onChange }: Props) {
+  const counts: Record<ToolTypeValue, number> = precomputed
+    ? {
+        all:     Object.values(precomputed).reduce((a, b) => a + b, 0),
+        app:     precomputed.app ?? 0,
+        library: precomputed.library ?? 0,
+        model:   precomputed.model ?? 0,
+      }
+    : {
+        all:     items.length,
+        app:     items.filter((i) => i.tool_type === "app").length,
+        library: items.filter((i) => i.tool_type === "library").length,
+        model:   items.filter((i) => i.tool_type === "model").length,
+      };
 
   return (
     <div className="inline-flex items-center gap-0.5 p-0.5 rounded-lg bg-gray-100 border border-gray-200">
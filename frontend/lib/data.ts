@@ -1,6 +1,6 @@
 import fs from "fs";
 import path from "path";
-import type { IndexData, CategoryData } from "./types";
+import type { IndexData, CategoryData, ToolItem } from "./types";
 
 const DATA_DIR = path.join(process.cwd(), "..", "data");
 
@@ -14,11 +14,75 @@ export function getIndexData(): IndexData {
   return JSON.parse(raw) as IndexData;
 }
 
+let stableItems: ToolItem[] | null | undefined;
+
+interface ScoreRow {
+  id: string;
+  rank?: number;
+  score?: number | null;
+  stars?: number | null;
+  trending_score?: number | null;
+  normalized_score?: number | null;
+  fetched_at?: string | null;
+}
+
+/**
+ * Joins data/catalogue.jsonl (id-sorted, stable fields) with the latest
+ * data/scores/YYYY-MM-DD.jsonl (rank, scores, fetched_at), in rank order.
+ * Returns null when the pipeline wrote the legacy layout instead.
+ */
+function readStableItems(): ToolItem[] | null {
+  if (stableItems !== undefined) return stableItems;
+
+  const cataloguePath = path.join(DATA_DIR, "catalogue.jsonl");
+  const scoresDir = path.join(DATA_DIR, "scores");
+  const latest = fs.existsSync(scoresDir)
+    ? fs.readdirSync(scoresDir).filter((f) => /^\d{4}-\d{2}-\d{2}\.jsonl$/.test(f)).sort().pop()
+    : undefined;
+  if (!fs.existsSync(cataloguePath) || !latest) {
+    stableItems = null;
+    return null;
+  }
+
+  const parseLines = (file: string) =>
+    fs.readFileSync(file, "utf-8").split("\n").filter(Boolean).map((line) => JSON.parse(line));
+
+  const scores = new Map<string, ScoreRow>();
+  for (const row of parseLines(path.join(scoresDir, latest)) as ScoreRow[]) {
+    scores.set(row.id, row);
+  }
+
+  const ranked = parseLines(cataloguePath).map((item) => {
+    const row: Partial<ScoreRow> = scores.get(item.id) ?? {};
+    return {
+      rank: row.rank ?? Number.MAX_SAFE_INTEGER,
+      item: {
+        ...item,
+        score: row.score ?? null,
+        stars: row.stars ?? null,
+        trending_score: row.trending_score ?? null,
+        normalized_score: row.normalized_score ?? undefined,
+        fetched_at: row.fetched_at ?? item.fetched_at ?? "",
+      } as ToolItem,
+    };
+  });
+  ranked.sort((a, b) => a.rank - b.rank);
+  stableItems = ranked.map((r) => r.item);
+  return stableItems;
+}
+
 /**
- * Reads data/categories/{slug}.json — all items for a specific category.
+ * Reads all items for a specific category, from the stable catalogue
+ * layout when present, else from data/categories/{slug}.json.
  * Called ONLY from Next.js Server Components during `next build`.
  */
 export function getCategoryData(slug: string): CategoryData {
+  const stable = readStableItems();
+  if (stable) {
+    const label = getIndexData().categories.find((c) => c.slug === slug)?.label ?? slug;
+    return { slug, label, items: stable.filter((item) => item.category === slug) };
+  }
+
   const raw = fs.readFileSync(
     path.join(DATA_DIR, "categories", `${slug}.json`),
     "utf-8"
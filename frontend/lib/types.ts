@@ -17,7 +17,9 @@ export interface ToolItem {
   thumbnail_url: string | null;
   is_new: boolean;
   trending_score: number | null;
+  normalized_score?: number;  // 0–1, comparable across sources
   tool_type: "app" | "library" | "model" | "unknown";
+  related_ids?: string[];  // most similar items first (TF-IDF cosine)
 }
 
 export interface CategoryCount {
@@ -26,17 +28,28 @@ export interface CategoryCount {
   count: number;
 }
 
+export interface Facets {
+  category: Record<string, number>;
+  source: Partial<Record<Source, number>>;
+  tool_type: Record<string, number>;
+  language: Record<string, number>;
+  is_new: { true: number; false: number };
+  category_tool_type: Record<string, Record<string, number>>;
+}
+
 export interface Metadata {
   generated_at: string;
   date: string;
   total_items: number;
   sources: Partial<Record<Source, number>>;
+  facets?: Facets;         // catalogue totals, precomputed by fetch_all
   schema_version: string;
 }
 
 export interface IndexData {
   metadata: Metadata;
   items: ToolItem[];       // top N trending items (for homepage)
+  facets?: Facets;         // counts over `items` only
   categories: CategoryCount[];
 }
 
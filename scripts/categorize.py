@@ -1,7 +1,12 @@
 """
 Keyword-based categorizer for AI tools and repos.
 The first matching category wins (order matters).
+
+`classify_items` classifies a whole batch, fanning chunks out to a process
+pool when the batch is large enough to pay for pool startup.
 """
+import os
+from concurrent.futures import ProcessPoolExecutor
 
 CATEGORIES = [
     {
@@ -160,18 +165,26 @@ _MODEL_SIGNALS = [
 ]
 
 
-def classify_tool_type(item: dict) -> str:
-    """
-    Classifies an item as 'app', 'library', or 'model'.
-    - 'app': consumer-facing tools, products, SaaS, dashboards
-    - 'library': developer frameworks, SDKs, packages, APIs
-    - 'model': model weights, checkpoints, fine-tunes
-    """
-    # Source is a strong signal: PH and YC almost always ship consumer apps
-    if item.get("source") in ("producthunt", "ycombinator"):
-        return "app"
+# Batches smaller than this are classified inline: spawning workers and
+# shipping chunks costs more than the keyword scan itself.
+PARALLEL_MIN_ITEMS = 5000
+CHUNK_SIZE = 1000
+
+# Lowercased keyword tables, built once per process by _init_tables()
+_CATEGORY_TABLE: list[tuple[str, tuple[str, ...]]] | None = None
+
 
-    text = " ".join(
+def _init_tables() -> None:
+    global _CATEGORY_TABLE
+    if _CATEGORY_TABLE is None:
+        _CATEGORY_TABLE = [
+            (cat["slug"], tuple(kw.lower() for kw in cat["keywords"]))
+            for cat in CATEGORIES
+        ]
+
+
+def _item_text(item: dict) -> str:
+    return " ".join(
         [
             item.get("title", "") or "",
             item.get("description", "") or "",
@@ -179,6 +192,12 @@ def classify_tool_type(item: dict) -> str:
         ]
     ).lower()
 
+
+def _tool_type_from_text(source: str | None, text: str) -> str:
+    # Source is a strong signal: PH and YC almost always ship consumer apps
+    if source in ("producthunt", "ycombinator"):
+        return "app"
+
     model_score = sum(1 for kw in _MODEL_SIGNALS if kw in text)
     lib_score = sum(1 for kw in _LIBRARY_SIGNALS if kw in text)
     app_score = sum(1 for kw in _APP_SIGNALS if kw in text)
@@ -191,28 +210,73 @@ def classify_tool_type(item: dict) -> str:
         return "app"
 
     # Default: most highly-starred GitHub AI repos are developer libraries/frameworks
-    if item.get("source") == "github":
+    if source == "github":
         return "library"
 
     return "app"
 
 
+def _category_from_text(text: str) -> str:
+    _init_tables()
+    for slug, keywords in _CATEGORY_TABLE:
+        for keyword in keywords:
+            if keyword in text:
+                return slug
+
+    return FALLBACK_CATEGORY
+
+
+def classify_tool_type(item: dict) -> str:
+    """
+    Classifies an item as 'app', 'library', or 'model'.
+    - 'app': consumer-facing tools, products, SaaS, dashboards
+    - 'library': developer frameworks, SDKs, packages, APIs
+    - 'model': model weights, checkpoints, fine-tunes
+    """
+    return _tool_type_from_text(item.get("source"), _item_text(item))
+
+
 def categorize(item: dict) -> str:
     """
     Returns the slug of the best-matching category for the given item.
     Matches against title + description + tags.
     """
-    text = " ".join(
-        [
-            item.get("title", "") or "",
-            item.get("description", "") or "",
-            " ".join(item.get("tags", [])),
-        ]
-    ).lower()
+    return _category_from_text(_item_text(item))
 
-    for category in CATEGORIES:
-        for keyword in category["keywords"]:
-            if keyword.lower() in text:
-                return category["slug"]
 
-    return FALLBACK_CATEGORY
+def _classify_chunk(chunk: list[tuple[str | None, str]]) -> list[tuple[str, str]]:
+    """Worker task: (source, text) pairs → (category, tool_type) pairs."""
+    return [
+        (_category_from_text(text), _tool_type_from_text(source, text))
+        for source, text in chunk
+    ]
+
+
+def classify_items(
+    items: list[dict],
+    workers: int | None = None,
+    min_parallel: int = PARALLEL_MIN_ITEMS,
+    chunk_size: int = CHUNK_SIZE,
+) -> list[tuple[str, str]]:
+    """
+    Returns (category, tool_type) for each item, in input order.
+
+    Only the lowercased text and source of each item are sent to workers;
+    the keyword tables are built once per worker by the pool initializer.
+    Falls back to inline classification for small batches or one worker.
+    """
+    workers = workers or os.cpu_count() or 1
+    rows = [(item.get("source"), _item_text(item)) for item in items]
+
+    if workers <= 1 or len(rows) < min_parallel:
+        return _classify_chunk(rows)
+
+    chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+    results: list[tuple[str, str]] = []
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(chunks)), initializer=_init_tables
+    ) as pool:
+        # map() yields in submission order, so the merge is stable
+        for chunk_result in pool.map(_classify_chunk, chunks):
+            results.extend(chunk_result)
+    return results
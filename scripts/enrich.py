@@ -0,0 +1,359 @@
+"""
+Metadata enrichment stage: fills in missing descriptions and thumbnails.
+
+Runs between dedup and categorize so the categorizer sees more than a bare
+title for HN links. For each item missing `description` or `thumbnail_url`:
+  - GitHub repos get the Open Graph card image (no request needed) and, when
+    the description is empty, the first paragraph of the README.
+  - Everything else gets og:/twitter:/meta description and image tags from
+    the page HTML.
+
+Requests run on a bounded thread pool with a minimum delay per host, and
+results are kept in a URL-keyed JSON cache with a TTL so each URL is fetched
+once rather than nightly.
+
+Page URLs are user-submitted and fetched from the CI runner, so every hop
+(redirects are followed by hand) must resolve to public addresses only.
+Hosts in ENRICH_ALLOW_HOSTS and the host of GITHUB_API_URL are exempt, for
+the local stand-in server.
+"""
+import codecs
+import ipaddress
+import json
+import logging
+import os
+import re
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# GitHub Actions sets GITHUB_API_URL; overriding it also lets the stage run
+# against a local stand-in server (scripts/enrich_standin.py).
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com")
+GITHUB_OG_IMAGE = "https://opengraph.githubassets.com/1/{owner}/{repo}"
+
+MAX_WORKERS = 8
+PER_HOST_DELAY = 1.0            # seconds between requests to the same host
+REQUEST_TIMEOUT = 10
+MAX_REDIRECTS = 5
+MAX_BYTES = 512 * 1024          # stop reading pages after 512 KB
+CACHE_TTL_DAYS = 30
+FAILURE_TTL_DAYS = 3            # retry failed URLs sooner than good ones
+MAX_DESCRIPTION_CHARS = 300
+MAX_FETCHES_PER_RUN = 300       # keep the nightly job bounded; the rest wait for tomorrow
+USER_AGENT = "ai-trends-bot/1.0 (+https://github.com/MdJunaidAhmed16/Curatia)"
+
+_GITHUB_REPO_RE = re.compile(r"^https?://github\.com/([\w.-]+)/([\w.-]+)/?$")
+_HEADER_CHARSET_RE = re.compile(r"charset=[\"']?([\w.:-]+)", re.I)
+_META_CHARSET_RE = re.compile(rb"<meta[^>]+charset=[\"']?\s*([\w.:-]+)", re.I)
+
+
+class _MetaParser(HTMLParser):
+    """Collects <meta> description/image tags from the document head."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta: dict[str, str] = {}
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "body":
+            self.done = True
+        if tag != "meta" or self.done:
+            return
+        attrs = dict(attrs)
+        key = (attrs.get("property") or attrs.get("name") or "").lower()
+        content = (attrs.get("content") or "").strip()
+        if key and content and key not in self.meta:
+            self.meta[key] = content
+
+
+class _HostThrottle:
+    """Enforces a minimum interval between requests to the same host."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._host_locks: dict[str, threading.Lock] = {}
+        self._last: dict[str, float] = {}
+
+    def wait(self, url: str) -> threading.Lock:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            host_lock = self._host_locks.setdefault(host, threading.Lock())
+        host_lock.acquire()
+        elapsed = time.monotonic() - self._last.get(host, 0.0)
+        if elapsed < self.delay:
+            time.sleep(self.delay - elapsed)
+        return host_lock
+
+    def release(self, url: str, host_lock: threading.Lock) -> None:
+        self._last[urlparse(url).netloc.lower()] = time.monotonic()
+        host_lock.release()
+
+
+def _clean_text(text: str | None) -> str | None:
+    if not text:
+        return None
+    text = " ".join(text.split())
+    if len(text) > MAX_DESCRIPTION_CHARS:
+        text = text[: MAX_DESCRIPTION_CHARS - 1].rstrip() + "…"
+    return text or None
+
+
+def _safe_image_url(base: str, src: str | None) -> str | None:
+    if not src:
+        return None
+    absolute = urljoin(base, src)
+    # The site's CSP only loads https: images
+    if urlparse(absolute).scheme != "https":
+        return None
+    return absolute
+
+
+def _trusted_hosts() -> set[str]:
+    hosts = {h.strip().lower() for h in os.environ.get("ENRICH_ALLOW_HOSTS", "").split(",")}
+    hosts.add((urlparse(GITHUB_API_URL).hostname or "").lower())
+    return hosts - {""}
+
+
+def _check_url(url: str) -> None:
+    """Raise ValueError unless `url` is http(s) and its host resolves to public addresses only."""
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise ValueError(f"refusing to fetch {url!r}")
+    host = parsed.hostname.lower()
+    if host in _trusted_hosts():
+        return
+    try:
+        infos = socket.getaddrinfo(host, parsed.port or 443, proto=socket.IPPROTO_TCP)
+    except socket.gaierror as exc:
+        raise ValueError(f"cannot resolve {host}: {exc}") from None
+    for info in infos:
+        ip = ipaddress.ip_address(info[4][0].split("%", 1)[0])
+        if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped:
+            ip = ip.ipv4_mapped
+        if not ip.is_global or ip.is_multicast:
+            raise ValueError(f"{host} resolves to non-public address {ip}")
+
+
+def _body_encoding(content_type: str, head: bytes) -> str:
+    """
+    Charset from the Content-Type header, else from a <meta charset> (or
+    http-equiv) tag near the top of the document, else UTF-8. requests
+    would assume ISO-8859-1 for text/html without a charset, which turns
+    UTF-8 descriptions into mojibake.
+    """
+    match = _HEADER_CHARSET_RE.search(content_type)
+    if match:
+        name = match.group(1)
+    else:
+        meta = _META_CHARSET_RE.search(head[:4096])
+        name = meta.group(1).decode("ascii") if meta else "utf-8"
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return "utf-8"
+
+
+def _get_text(url: str, headers: dict, throttle: _HostThrottle) -> str:
+    """
+    GET a page politely and return at most MAX_BYTES of its body. Redirects
+    are followed one hop at a time so each target passes _check_url.
+    """
+    for _ in range(MAX_REDIRECTS + 1):
+        _check_url(url)
+        host_lock = throttle.wait(url)
+        try:
+            with requests.get(
+                url, headers=headers, timeout=REQUEST_TIMEOUT, stream=True,
+                allow_redirects=False,
+            ) as resp:
+                if not resp.is_redirect:
+                    resp.raise_for_status()
+                    chunks, size = [], 0
+                    for chunk in resp.iter_content(chunk_size=16384):
+                        chunks.append(chunk)
+                        size += len(chunk)
+                        if size >= MAX_BYTES:
+                            break
+                    body = b"".join(chunks)
+                    encoding = _body_encoding(resp.headers.get("Content-Type", ""), body)
+                    return body.decode(encoding, errors="replace")
+                location = resp.headers["Location"]
+        finally:
+            throttle.release(url, host_lock)
+        url = urljoin(url, location)
+    raise ValueError(f"more than {MAX_REDIRECTS} redirects")
+
+def _readme_summary(markdown: str) -> str | None:
+    """First prose paragraph of a README, with markdown/HTML noise stripped."""
+    paragraph: list[str] = []
+    for line in markdown.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            if paragraph:
+                break
+            continue
+        if stripped.startswith(("#", "!", "[![", "<", "```", "|", "---", "===")):
+            if paragraph:
+                break
+            continue
+        paragraph.append(stripped)
+    text = " ".join(paragraph)
+    text = re.sub(r"!\[[^\]]*\]\([^)]*\)", "", text)       # images
+    text = re.sub(r"\[([^\]]*)\]\([^)]*\)", r"\1", text)    # links → label
+    text = re.sub(r"[*_`]+", "", text)
+    return _clean_text(text)
+
+
+def _fetch_github(url: str, throttle: _HostThrottle) -> dict:
+    owner, repo = _GITHUB_REPO_RE.match(url).groups()
+    meta = {"image": GITHUB_OG_IMAGE.format(owner=owner, repo=repo)}
+    headers = {
+        "Accept": "application/vnd.github.raw+json",
+        "User-Agent": USER_AGENT,
+    }
+    token = os.environ.get("GITHUB_TOKEN", "")
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    readme = _get_text(
+        f"{GITHUB_API_URL.rstrip('/')}/repos/{owner}/{repo}/readme", headers, throttle
+    )
+    meta["description"] = _readme_summary(readme)
+    return meta
+
+
+def _fetch_page_meta(url: str, throttle: _HostThrottle) -> dict:
+    html = _get_text(url, {"User-Agent": USER_AGENT, "Accept": "text/html"}, throttle)
+    parser = _MetaParser()
+    parser.feed(html)
+    m = parser.meta
+    return {
+        "description": _clean_text(
+            m.get("og:description") or m.get("twitter:description") or m.get("description")
+        ),
+        "image": _safe_image_url(
+            url, m.get("og:image") or m.get("og:image:url") or m.get("twitter:image")
+        ),
+    }
+
+
+def _needs_enrichment(item: dict) -> bool:
+    return not item.get("description") or not item.get("thumbnail_url")
+
+
+def _needs_request(item: dict) -> bool:
+    # GitHub card images are deterministic; only a missing description
+    # justifies a README request.
+    if _GITHUB_REPO_RE.match(item["url"]):
+        return not item.get("description")
+    return True
+
+
+def _load_cache(path: Path) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable enrichment cache %s: %s", path, exc)
+        return {}
+
+
+def _is_fresh(entry: dict, now: float) -> bool:
+    ttl_days = FAILURE_TTL_DAYS if entry.get("error") else CACHE_TTL_DAYS
+    return now - entry.get("fetched_at", 0) < ttl_days * 86400
+
+
+def enrich(
+    items: list[dict],
+    cache_path: Path,
+    max_workers: int = MAX_WORKERS,
+    per_host_delay: float = PER_HOST_DELAY,
+) -> list[dict]:
+    """
+    Fill missing `description` / `thumbnail_url` fields in place.
+    Existing values are never overwritten. Returns the same list.
+    """
+    now = time.time()
+    cache = _load_cache(cache_path)
+    cache = {url: e for url, e in cache.items() if _is_fresh(e, now)}
+
+    targets = [item for item in items if _needs_enrichment(item)]
+    for item in targets:
+        gh = _GITHUB_REPO_RE.match(item["url"])
+        if gh and not item.get("thumbnail_url"):
+            item["thumbnail_url"] = GITHUB_OG_IMAGE.format(
+                owner=gh.group(1), repo=gh.group(2)
+            )
+
+    pending = sorted(
+        {
+            item["url"]
+            for item in targets
+            if _needs_request(item)
+            and item["url"] not in cache
+            and urlparse(item["url"]).scheme in ("http", "https")
+        }
+    )
+
+    if len(pending) > MAX_FETCHES_PER_RUN:
+        logger.info(
+            "Enrichment: %d URLs pending, fetching the first %d this run",
+            len(pending), MAX_FETCHES_PER_RUN,
+        )
+        pending = pending[:MAX_FETCHES_PER_RUN]
+
+    throttle = _HostThrottle(per_host_delay)
+
+    def _work(url: str) -> tuple[str, dict]:
+        try:
+            if _GITHUB_REPO_RE.match(url):
+                meta = _fetch_github(url, throttle)
+            else:
+                meta = _fetch_page_meta(url, throttle)
+        except Exception as exc:
+            logger.debug("Enrichment failed for %s: %s", url, exc)
+            meta = {"error": str(exc)[:200]}
+        meta["fetched_at"] = now
+        return url, meta
+
+    if pending:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for url, meta in pool.map(_work, pending):
+                cache[url] = meta
+
+    filled = 0
+    for item in targets:
+        entry = cache.get(item["url"])
+        if not entry or entry.get("error"):
+            continue
+        changed = False
+        if not item.get("description") and entry.get("description"):
+            item["description"] = entry["description"]
+            changed = True
+        if not item.get("thumbnail_url") and entry.get("image"):
+            item["thumbnail_url"] = entry["image"]
+            changed = True
+        filled += changed
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, sort_keys=True)
+
+    logger.info(
+        "Enrichment: %d items needed metadata, %d URLs fetched, %d items filled from cache",
+        len(targets), len(pending), filled,
+    )
+    return items
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the sites the enrichment stage (enrich.py) fetches, for
+testing it without touching real hosts.
+
+Serves a handful of HTML pages covering the cases enrich has to handle
+(Open Graph tags, twitter:/meta fallbacks, UTF-8 pages whose header has no
+charset, a Latin-1 page, relative and http: image URLs, redirects to an
+allowed page and to a link-local address, a 404) plus the GitHub README
+endpoint, /repos/<owner>/<repo>/readme.
+
+  python scripts/enrich_standin.py serve --port 8789
+  python scripts/enrich_standin.py check --delay 0.2
+
+`check` starts the server in-process, allows its host through
+ENRICH_ALLOW_HOSTS and runs enrich() twice against it with a throwaway
+cache: the first run shows what gets filled in and the smallest gap between
+two requests (all pages share one host, so it is at least --delay); the
+second run should make no requests at all.
+
+HTTP endpoints (GET):
+  /pages/<name>                   see PAGES and REDIRECTS
+  /repos/<owner>/<repo>/readme    raw markdown
+  /_stats                         request count per path (JSON)
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+logger = logging.getLogger("enrich_standin")
+
+# name → (Content-Type, body)
+PAGES: dict[str, tuple[str, bytes]] = {
+    "og": (
+        "text/html; charset=utf-8",
+        b'<html><head><meta property="og:description" content="Open Graph description">'
+        b'<meta property="og:image" content="https://example.com/card.png"></head>'
+        b"<body></body></html>",
+    ),
+    "twitter": (
+        "text/html; charset=utf-8",
+        b'<html><head><meta name="twitter:description" content="Twitter card description">'
+        b'<meta name="twitter:image" content="/img/card.png"></head></html>',
+    ),
+    "meta-only": (
+        "text/html; charset=utf-8",
+        b'<html><head><meta name="description" content="Plain meta description"></head></html>',
+    ),
+    "utf8-no-charset": (
+        "text/html",
+        '<html><head><meta charset="utf-8">'
+        '<meta property="og:description" content="Café-grade résumé parsing — naïve no more">'
+        "</head></html>".encode("utf-8"),
+    ),
+    "utf8-bare": (
+        "text/html",
+        '<html><head><meta property="og:description" content="Ünïcode with no charset anywhere">'
+        "</head></html>".encode("utf-8"),
+    ),
+    "latin1": (
+        "text/html; charset=ISO-8859-1",
+        '<html><head><meta property="og:description" content="Déjà vu for señor data">'
+        "</head></html>".encode("latin-1"),
+    ),
+    "http-image": (
+        "text/html; charset=utf-8",
+        b'<html><head><meta property="og:description" content="Card image over plain http">'
+        b'<meta property="og:image" content="http://example.com/card.png"></head></html>',
+    ),
+    "body-meta": (
+        "text/html; charset=utf-8",
+        b'<html><head><title>x</title></head><body>'
+        b'<meta property="og:description" content="Ignored: after body"></body></html>',
+    ),
+}
+
+# name → Location
+REDIRECTS: dict[str, str] = {
+    "moved": "/pages/og",
+    "to-metadata": "http://169.254.169.254/latest/meta-data/",
+}
+
+README = b"""# standin-repo
+
+[![build](https://example.com/badge.svg)](https://example.com)
+
+A **stand-in** repository whose README summary is its first [prose](https://example.com) paragraph.
+
+## Install
+"""
+
+
+def make_handler(stats: dict[str, int], lock: threading.Lock):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, content_type: str, body: bytes) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            path = urlparse(self.path).path
+            if path == "/_stats":
+                with lock:
+                    body = json.dumps(stats).encode("utf-8")
+                self._send(200, "application/json; charset=utf-8", body)
+                return
+
+            with lock:
+                stats[path] = stats.get(path, 0) + 1
+            name = path[len("/pages/"):] if path.startswith("/pages/") else None
+            if name in PAGES:
+                self._send(200, *PAGES[name])
+            elif name in REDIRECTS:
+                self.send_response(302)
+                self.send_header("Location", REDIRECTS[name])
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+            elif path.startswith("/repos/") and path.endswith("/readme"):
+                self._send(200, "application/vnd.github.raw+json", README)
+            else:
+                self._send(404, "text/html", b"<html><body>Not found</body></html>")
+
+        def log_message(self, fmt, *args):
+            logger.debug("%s - %s", self.address_string(), fmt % args)
+
+    return Handler
+
+
+def run_check(delay: float) -> None:
+    stats: dict[str, int] = {}
+    lock = threading.Lock()
+    times: list[float] = []
+
+    base = make_handler(stats, lock)
+
+    class Timed(base):
+        def do_GET(self):
+            if not self.path.startswith("/_stats"):
+                with lock:
+                    times.append(time.monotonic())
+            super().do_GET()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Timed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    root = f"http://{host}:{port}"
+
+    # enrich reads GITHUB_API_URL at import time
+    os.environ["GITHUB_API_URL"] = root
+    os.environ["ENRICH_ALLOW_HOSTS"] = host
+    sys.path.insert(0, str(Path(__file__).parent))
+    from enrich import enrich
+
+    def fresh_items() -> list[dict]:
+        items = [
+            {"id": f"standin_{name}", "url": f"{root}/pages/{name}"}
+            for name in list(PAGES) + list(REDIRECTS) + ["missing"]
+        ]
+        items.append({"id": "gh_standin_repo", "url": "https://github.com/standin/repo"})
+        for item in items:
+            item.update(description=None, thumbnail_url=None)
+        return items
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = Path(tmp) / "enrich.json"
+
+        items = enrich(fresh_items(), cache_path, per_host_delay=delay)
+        first = sum(stats.values())
+        for item in items:
+            print(f"{item['id']}:")
+            print(f"  description:   {item['description']}")
+            print(f"  thumbnail_url: {item['thumbnail_url']}")
+        gaps = [b - a for a, b in zip(times, times[1:])]
+        print(f"run 1: {first} requests, smallest gap {min(gaps, default=0):.2f}s (delay {delay}s)")
+
+        enrich(fresh_items(), cache_path, per_host_delay=delay)
+        print(f"run 2: {sum(stats.values()) - first} requests (cache hits)")
+
+    server.shutdown()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="run the stand-in server")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8789)
+
+    check = sub.add_parser("check", help="run enrich() twice against an in-process server")
+    check.add_argument("--delay", type=float, default=0.2, help="per-host delay passed to enrich()")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "check":
+        run_check(args.delay)
+        return
+
+    stats: dict[str, int] = {}
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(stats, threading.Lock()))
+    logger.info("Enrichment stand-in on http://%s:%d", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
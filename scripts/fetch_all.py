@@ -2,15 +2,33 @@
 """
 Nightly AI Trends orchestrator.
 
-Calls all source fetchers, deduplicates by URL, categorizes each item,
-sorts by trending_score, and writes:
-  - data/index.json                    top 100 trending items (homepage)
+Calls the registered source fetchers (all enabled ones, or the subset given
+with --sources; items from sources not run are carried over from the last
+output), deduplicates by URL, enriches missing
+descriptions/thumbnails, categorizes each item, links related items,
+normalises scores per source, sorts by normalized_score, and writes:
+  - data/index.json                    top 100 items under per-source and
+                                       per-category quotas (homepage)
   - data/categories/{slug}.json        all items per category
   - data/history/YYYY-MM-DD.json       daily snapshot of index (top 100)
+    or, with OUTPUT_LAYOUT=stable, instead of those two (leftover legacy
+    category files are removed and history is only pruned):
+  - data/catalogue.jsonl               id-sorted items without volatile fields
+  - data/scores/YYYY-MM-DD.jsonl       id-sorted rank and scores for the day
+  - data/movers.json                   rank/score movement since the previous run
+  - data/items.bin                     mmap-able binary store of all items
+                                       (only with WRITE_ITEM_STORE=1)
+
+Usage:
+  python scripts/fetch_all.py
+  python scripts/fetch_all.py --sources github,hackernews
+  python scripts/fetch_all.py --list-sources
 """
 
+import argparse
 import json
 import logging
+import os
 import sys
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -18,8 +36,14 @@ from pathlib import Path
 # Ensure scripts/ is on the path so imports work when run from the repo root
 sys.path.insert(0, str(Path(__file__).parent))
 
-from categorize import categorize, classify_tool_type, CATEGORIES
-from sources import github_repos, hackernews, producthunt, ycombinator, twitter
+from categorize import classify_items, CATEGORIES
+from enrich import enrich
+from item_store import write_store
+from related import add_related
+from movers import compute_movers, load_previous_state, rank_state, save_state
+from normalize import normalize_scores, recent_scores, select_top
+from layout import CATALOGUE_FILE, SCORES_DIR, read_catalogue, write_catalogue
+from sources import SOURCES, has_required_env, run_source, select_sources
 
 logging.basicConfig(
     level=logging.INFO,
@@ -33,6 +57,13 @@ DATA_DIR = REPO_ROOT / "data"
 HISTORY_DIR = DATA_DIR / "history"
 CATEGORIES_DIR = DATA_DIR / "categories"
 
+# Persistent URL-keyed metadata cache (restored between runs by actions/cache)
+ENRICH_CACHE_PATH = REPO_ROOT / ".cache" / "enrich.json"
+# TF-IDF state from the previous run, for incremental related-items updates
+RELATED_STATE_PATH = REPO_ROOT / ".cache" / "related.json"
+# Compact id → (rank, score) maps from previous runs, for the movers diff
+RANK_STATE_DIR = REPO_ROOT / ".cache" / "ranks"
+
 # Number of top-trending items to include in index.json (homepage)
 TOP_N = 100
 
@@ -58,14 +89,14 @@ def _deduplicate(items: list[dict]) -> list[dict]:
     return list(seen.values())
 
 
-def _prune_history(history_dir: Path, keep_days: int = 14) -> None:
+def _prune_history(history_dir: Path, keep_days: int = 14, suffix: str = ".json") -> None:
     """
-    Delete history JSON files older than `keep_days` days.
-    Only touches files named YYYY-MM-DD.json to avoid accidents.
+    Delete history files older than `keep_days` days.
+    Only touches files named YYYY-MM-DD{suffix} to avoid accidents.
     """
     cutoff = datetime.now(timezone.utc) - timedelta(days=keep_days)
     deleted = 0
-    for path in sorted(history_dir.glob("????-??-??.json")):
+    for path in sorted(history_dir.glob(f"????-??-??{suffix}")):
         try:
             file_date = datetime.strptime(path.stem, "%Y-%m-%d").replace(
                 tzinfo=timezone.utc
@@ -80,19 +111,74 @@ def _prune_history(history_dir: Path, keep_days: int = 14) -> None:
         logger.info("Pruned %d history file(s) older than %d days", deleted, keep_days)
 
 
-def _compute_category_counts(items: list[dict]) -> list[dict]:
-    counts: dict[str, int] = {}
+def _load_previous_items(source_names: set[str]) -> list[dict]:
+    """Items from `source_names` in the last written output."""
+    stable = read_catalogue(DATA_DIR)
+    if stable is not None:
+        return [item for item in stable if item.get("source") in source_names]
+
+    items: dict[str, dict] = {}
+    for path in sorted(CATEGORIES_DIR.glob("*.json")):
+        try:
+            with open(path, encoding="utf-8") as f:
+                cat_items = json.load(f).get("items", [])
+        except (OSError, ValueError) as exc:
+            logger.warning("Could not read %s for carry-over: %s", path, exc)
+            continue
+        for item in cat_items:
+            if item.get("source") in source_names:
+                items[item["id"]] = item
+    return list(items.values())
+
+
+def _aggregate_facets(items: list[dict]) -> tuple[dict, dict[str, list]]:
+    """
+    Single pass over `items` computing every facet count the site filters on,
+    plus the per-category item lists. Returns (facets, by_category).
+    """
+    category: dict[str, int] = {}
+    source: dict[str, int] = {}
+    tool_type: dict[str, int] = {}
+    language: dict[str, int] = {}
+    is_new = {"true": 0, "false": 0}
+    category_tool_type: dict[str, dict[str, int]] = {}
+    by_category: dict[str, list] = {}
+
     for item in items:
         cat = item.get("category", "")
-        counts[cat] = counts.get(cat, 0) + 1
+        src = item["source"]
+        ttype = item.get("tool_type", "")
+        lang = item.get("language")
+
+        category[cat] = category.get(cat, 0) + 1
+        source[src] = source.get(src, 0) + 1
+        tool_type[ttype] = tool_type.get(ttype, 0) + 1
+        if lang:
+            language[lang] = language.get(lang, 0) + 1
+        is_new["true" if item.get("is_new") else "false"] += 1
+        cross = category_tool_type.setdefault(cat, {})
+        cross[ttype] = cross.get(ttype, 0) + 1
+        by_category.setdefault(cat, []).append(item)
+
+    facets = {
+        "category": category,
+        "source": source,
+        "tool_type": tool_type,
+        "language": dict(sorted(language.items(), key=lambda kv: (-kv[1], kv[0]))),
+        "is_new": is_new,
+        "category_tool_type": category_tool_type,
+    }
+    return facets, by_category
+
 
-    category_list = [{"slug": "all", "label": "All Tools", "count": len(items)}]
+def _category_list(total: int, category_counts: dict[str, int]) -> list[dict]:
+    category_list = [{"slug": "all", "label": "All Tools", "count": total}]
     for cat in CATEGORIES:
         category_list.append(
             {
                 "slug": cat["slug"],
                 "label": cat["label"],
-                "count": counts.get(cat["slug"], 0),
+                "count": category_counts.get(cat["slug"], 0),
             }
         )
     return category_list
@@ -102,28 +188,51 @@ def _compute_category_counts(items: list[dict]) -> list[dict]:
 # Main
 # ---------------------------------------------------------------------------
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Nightly AI Trends orchestrator")
+    parser.add_argument(
+        "--sources",
+        help="comma-separated subset of sources to refresh, e.g. github,hackernews",
+    )
+    parser.add_argument(
+        "--list-sources", action="store_true", help="print the source registry and exit"
+    )
+    args = parser.parse_args(argv)
+
+    if args.list_sources:
+        for source in SOURCES:
+            print(
+                f"{source['name']:<12} {source['cadence']:<7} "
+                f"{'enabled' if source['enabled'] else 'disabled':<9} "
+                f"{'env ok' if has_required_env(source) else 'env missing'}"
+            )
+        return
+
     now = datetime.now(timezone.utc)
     today = now.strftime("%Y-%m-%d")
     logger.info("Starting nightly fetch for %s", today)
 
-    # --- Fetch from all sources (failures are isolated) ---
-    all_items: list[dict] = []
-
-    logger.info("=== GitHub Repos ===")
-    all_items.extend(github_repos.fetch())
+    names = [n.strip() for n in args.sources.split(",") if n.strip()] if args.sources else None
+    try:
+        selected = select_sources(names, now.date())
+    except KeyError as exc:
+        parser.error(exc.args[0])
 
-    logger.info("=== Hacker News ===")
-    all_items.extend(hackernews.fetch())
-
-    logger.info("=== Product Hunt ===")
-    all_items.extend(producthunt.fetch())
-
-    logger.info("=== YCombinator ===")
-    all_items.extend(ycombinator.fetch())
-
-    logger.info("=== Twitter/X ===")
-    all_items.extend(twitter.fetch())
+    # --- Fetch from the selected sources (failures are isolated) ---
+    all_items: list[dict] = []
+    for source in selected:
+        logger.info("=== %s ===", source["label"])
+        all_items.extend(run_source(source))
+
+    # --- Carry over items from enabled sources that were not refreshed ---
+    carried = {s["name"] for s in SOURCES if s["enabled"]} - {s["name"] for s in selected}
+    if carried:
+        previous = _load_previous_items(carried)
+        logger.info(
+            "Carried over %d items from previous output for: %s",
+            len(previous), ", ".join(sorted(carried)),
+        )
+        all_items.extend(previous)
 
     logger.info("Raw total before dedup: %d items", len(all_items))
 
@@ -131,19 +240,36 @@ def main() -> None:
     items = _deduplicate(all_items)
     logger.info("After dedup: %d items", len(items))
 
-    # --- Categorize and classify tool type ---
-    for item in items:
-        item["category"] = categorize(item)
-        item["tool_type"] = classify_tool_type(item)
+    # --- Enrich missing descriptions / thumbnails (set ENRICH_METADATA=0 to skip) ---
+    if os.environ.get("ENRICH_METADATA", "1") != "0":
+        enrich(items, ENRICH_CACHE_PATH)
 
-    # --- Sort: items with trending_score first (desc), then None-score items ---
-    items.sort(key=lambda x: x.get("trending_score") or -1, reverse=True)
+    # --- Categorize and classify tool type (process pool for large batches) ---
+    for item, (category, tool_type) in zip(items, classify_items(items)):
+        item["category"] = category
+        item["tool_type"] = tool_type
 
-    # --- Source counts ---
-    source_counts: dict[str, int] = {}
-    for item in items:
-        src = item["source"]
-        source_counts[src] = source_counts.get(src, 0) + 1
+    # --- Related tools: top-k TF-IDF neighbours per item ---
+    add_related(items, RELATED_STATE_PATH)
+
+    # Stable layout: the committed scores files back up the rank-state cache
+    stable_layout = os.environ.get("OUTPUT_LAYOUT", "legacy") == "stable"
+    scores_dir = DATA_DIR / SCORES_DIR if stable_layout else None
+
+    # --- Normalise scores per source (today + recent runs) and sort ---
+    score_stats = normalize_scores(
+        items,
+        history=recent_scores(RANK_STATE_DIR, before=today, scores_dir=scores_dir),
+        now=now,
+    )
+    items.sort(
+        key=lambda x: (x["normalized_score"], x.get("trending_score") or -1),
+        reverse=True,
+    )
+
+    # --- Facet counts and per-category lists in one pass ---
+    facets, by_category = _aggregate_facets(items)
+    source_counts = facets["source"]
 
     # --- Assemble payload ---
     payload = {
@@ -152,21 +278,37 @@ def main() -> None:
             "date": today,
             "total_items": len(items),
             "sources": source_counts,
+            "facets": facets,
+            "score_stats": score_stats,
             "schema_version": "1.0",
         },
         "items": items,
-        "categories": _compute_category_counts(items),
+        "categories": _category_list(len(items), facets["category"]),
     }
 
+    # Previous ranking for movers.json, read before this run's catalogue
+    # replaces the one the latest scores file was written with
+    prev_state = load_previous_state(
+        RANK_STATE_DIR,
+        HISTORY_DIR,
+        before=today,
+        scores_dir=scores_dir,
+        catalogue_path=DATA_DIR / CATALOGUE_FILE,
+    )
+
     # --- Write files ---
     DATA_DIR.mkdir(exist_ok=True)
     HISTORY_DIR.mkdir(exist_ok=True)
     CATEGORIES_DIR.mkdir(exist_ok=True)
 
-    # index.json — top N trending items for the homepage
+    # index.json — top N items for the homepage, under source/category quotas.
+    # metadata.facets counts the whole catalogue; the top-level facets block
+    # counts only these items, for the filters over the homepage grid.
+    top_items = select_top(items, TOP_N)
     index_payload = {
         "metadata": payload["metadata"],
-        "items": items[:TOP_N],
+        "items": top_items,
+        "facets": _aggregate_facets(top_items)[0],
         "categories": payload["categories"],
     }
     index_path = DATA_DIR / "index.json"
@@ -174,34 +316,66 @@ def main() -> None:
         json.dump(index_payload, f, indent=2, ensure_ascii=False)
     logger.info("Written: %s (%d items)", index_path, len(index_payload["items"]))
 
-    # categories/{slug}.json — all items for each category
-    by_category: dict[str, list] = {}
-    for item in items:
-        cat = item.get("category", "")
-        by_category.setdefault(cat, []).append(item)
+    if stable_layout:
+        # catalogue.jsonl + scores/{today}.jsonl — byte-stable lines for git
+        catalogue_path, scores_path = write_catalogue(items, DATA_DIR, today, top=top_items)
+        logger.info("Written: %s and %s (%d items)", catalogue_path, scores_path, len(items))
+        # Readers prefer the catalogue, so legacy category files would only go stale
+        for path in CATEGORIES_DIR.glob("*.json"):
+            path.unlink()
+            logger.info("Removed legacy category file: %s", path.name)
+    else:
+        # categories/{slug}.json — all items for each category
+        for cat_info in CATEGORIES:
+            slug = cat_info["slug"]
+            cat_items = by_category.get(slug, [])
+            cat_path = CATEGORIES_DIR / f"{slug}.json"
+            cat_payload = {
+                "slug": slug,
+                "label": cat_info["label"],
+                "items": cat_items,
+            }
+            with open(cat_path, "w", encoding="utf-8") as f:
+                json.dump(cat_payload, f, indent=2, ensure_ascii=False)
+            logger.info("Written: %s (%d items)", cat_path, len(cat_items))
+
+    # items.bin — binary store with id index and category/source offset lists
+    if os.environ.get("WRITE_ITEM_STORE") == "1":
+        store_path = DATA_DIR / "items.bin"
+        write_store(items, store_path)
+        logger.info("Written: %s (%d items)", store_path, len(items))
+
+    # movers.json — hash join of today's ranking against the previous run's
+    movers_payload = {
+        "metadata": {
+            "generated_at": now.isoformat(),
+            "date": today,
+            "top_n": TOP_N,
+        },
+        **compute_movers(items, prev_state, top=top_items),
+    }
+    movers_path = DATA_DIR / "movers.json"
+    with open(movers_path, "w", encoding="utf-8") as f:
+        json.dump(movers_payload, f, indent=2, ensure_ascii=False)
+    save_state(rank_state(items, today, top=top_items), RANK_STATE_DIR)
+    logger.info(
+        "Written: %s (vs %s)", movers_path, movers_payload["previous_date"] or "nothing"
+    )
 
-    for cat_info in CATEGORIES:
-        slug = cat_info["slug"]
-        cat_items = by_category.get(slug, [])
-        cat_path = CATEGORIES_DIR / f"{slug}.json"
-        cat_payload = {
-            "slug": slug,
-            "label": cat_info["label"],
-            "items": cat_items,
-        }
-        with open(cat_path, "w", encoding="utf-8") as f:
-            json.dump(cat_payload, f, indent=2, ensure_ascii=False)
-        logger.info("Written: %s (%d items)", cat_path, len(cat_items))
-
-    # history — daily snapshot of index (top N items)
-    history_path = HISTORY_DIR / f"{today}.json"
-    if not history_path.exists():
-        with open(history_path, "w", encoding="utf-8") as f:
-            json.dump(index_payload, f, indent=2, ensure_ascii=False)
-        logger.info("Written: %s", history_path)
-
-    # --- Prune history files older than 14 days ---
-    _prune_history(HISTORY_DIR, keep_days=14)
+    # history — daily snapshot of index (top N items); the stable layout's
+    # per-day scores files take its place, and old snapshots age out
+    if stable_layout:
+        _prune_history(DATA_DIR / SCORES_DIR, keep_days=14, suffix=".jsonl")
+        _prune_history(HISTORY_DIR, keep_days=14)
+    else:
+        history_path = HISTORY_DIR / f"{today}.json"
+        if not history_path.exists():
+            with open(history_path, "w", encoding="utf-8") as f:
+                json.dump(index_payload, f, indent=2, ensure_ascii=False)
+            logger.info("Written: %s", history_path)
+
+        # --- Prune history files older than 14 days ---
+        _prune_history(HISTORY_DIR, keep_days=14)
 
     logger.info(
         "Done. %d items from sources: %s",
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the GitHub endpoints sources/github_repos.py calls, for
+testing the token pool without spending real rate limit.
+
+Serves /search/repositories and /rate_limit. Every bearer token gets its own
+search bucket of --limit requests per --window seconds, reported in the
+X-RateLimit-* headers the way GitHub reports them; an empty bucket answers
+403 with X-RateLimit-Remaining: 0. Search results are synthetic but stable:
+the same query always returns the same repos.
+
+  python scripts/github_standin.py --limit 10 serve --port 8788
+  python scripts/github_standin.py --limit 10 --window 20 check --tokens 3
+
+`check` starts the server in-process, runs github_repos.fetch() against it
+with that many tokens and prints how the searches were spread across them.
+
+HTTP endpoints (GET, JSON):
+  /search/repositories?q=..&per_page=..
+  /rate_limit
+  /_stats      searches served and rejected per token
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+logger = logging.getLogger("github_standin")
+
+DEFAULT_LIMIT = 30          # GitHub's authenticated search limit per minute
+DEFAULT_WINDOW = 60
+REPOS_PER_QUERY = 5
+
+
+class SearchBuckets:
+    """Per-token search budget in fixed windows, plus served/rejected counts."""
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self._lock = threading.Lock()
+        self._buckets: dict[str, list[float]] = {}   # token → [used, window_start]
+        self.stats: dict[str, dict[str, int]] = {}
+
+    def _bucket(self, token: str, now: float) -> list[float]:
+        bucket = self._buckets.setdefault(token, [0, now])
+        if now >= bucket[1] + self.window:
+            bucket[0], bucket[1] = 0, now
+        return bucket
+
+    def spend(self, token: str) -> tuple[bool, dict[str, str]]:
+        """Charge one search to `token`. Returns (allowed, rate-limit headers)."""
+        now = time.time()
+        with self._lock:
+            bucket = self._bucket(token, now)
+            allowed = bucket[0] < self.limit
+            if allowed:
+                bucket[0] += 1
+            counts = self.stats.setdefault(token, {"served": 0, "rejected": 0})
+            counts["served" if allowed else "rejected"] += 1
+            return allowed, self._headers(bucket)
+
+    def snapshot(self, token: str) -> dict:
+        with self._lock:
+            bucket = self._bucket(token, time.time())
+            return {
+                "limit": self.limit,
+                "remaining": self.limit - int(bucket[0]),
+                "reset": math.ceil(bucket[1] + self.window),
+                "used": int(bucket[0]),
+            }
+
+    def _headers(self, bucket: list[float]) -> dict[str, str]:
+        return {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.limit - int(bucket[0])),
+            "X-RateLimit-Reset": str(math.ceil(bucket[1] + self.window)),
+            "X-RateLimit-Used": str(int(bucket[0])),
+            "X-RateLimit-Resource": "search",
+        }
+
+
+def fake_repos(query: str, count: int) -> list[dict]:
+    """Stable synthetic search results for `query`."""
+    digest = hashlib.blake2b(query.encode("utf-8"), digest_size=4).hexdigest()
+    topics = [part[len("topic:"):] for part in query.split() if part.startswith("topic:")]
+    created = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    repos = []
+    for i in range(count):
+        owner, name = f"standin-{digest}", f"{'-'.join(topics) or 'repo'}-{i}"
+        repos.append({
+            "full_name": f"{owner}/{name}",
+            "name": name,
+            "html_url": f"https://github.com/{owner}/{name}",
+            "description": f"Stand-in result {i} for {query}",
+            "owner": {"login": owner},
+            "stargazers_count": (int(digest, 16) % 1000) + 10 * (count - i),
+            "topics": topics,
+            "language": "Python",
+            "created_at": created,
+        })
+    return repos
+
+
+def make_handler(buckets: SearchBuckets):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body, headers: dict[str, str] | None = None) -> None:
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _token(self) -> str:
+            auth = self.headers.get("Authorization", "")
+            return auth.split(" ", 1)[1] if " " in auth else "anonymous"
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            token = self._token()
+            if url.path == "/search/repositories":
+                allowed, headers = buckets.spend(token)
+                if not allowed:
+                    self._send(403, {"message": "API rate limit exceeded"}, headers)
+                    return
+                params = parse_qs(url.query)
+                query = params.get("q", [""])[0]
+                per_page = min(int(params.get("per_page", ["30"])[0]), REPOS_PER_QUERY)
+                repos = fake_repos(query, per_page)
+                self._send(200, {"total_count": len(repos), "items": repos}, headers)
+            elif url.path == "/rate_limit":
+                search = buckets.snapshot(token)
+                self._send(200, {"resources": {"search": search}})
+            elif url.path == "/_stats":
+                self._send(200, buckets.stats)
+            else:
+                self._send(404, {"message": "Not Found"})
+
+        def log_message(self, fmt, *args):
+            logger.debug("%s - %s", self.address_string(), fmt % args)
+
+    return Handler
+
+
+def start_server(host: str, port: int, buckets: SearchBuckets) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), make_handler(buckets))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_check(tokens: int, buckets: SearchBuckets) -> None:
+    server = start_server("127.0.0.1", 0, buckets)
+    host, port = server.server_address[:2]
+
+    # github_repos reads these at import time
+    os.environ["GITHUB_API_URL"] = f"http://{host}:{port}"
+    os.environ["GITHUB_TOKENS"] = ",".join(f"standin-{i + 1}" for i in range(tokens))
+    os.environ.pop("GITHUB_TOKEN", None)
+    sys.path.insert(0, str(Path(__file__).parent))
+    from sources import github_repos
+
+    started = time.time()
+    items = github_repos.fetch()
+    server.shutdown()
+
+    print(f"{len(items)} repos in {time.time() - started:.1f}s")
+    for token, counts in sorted(buckets.stats.items()):
+        print(f"  {token}: {counts['served']} served, {counts['rejected']} rejected")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--limit", type=int, default=DEFAULT_LIMIT, help="searches per token per window")
+    parser.add_argument("--window", type=float, default=DEFAULT_WINDOW, help="rate-limit window in seconds")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="run the stand-in server")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8788)
+
+    check = sub.add_parser("check", help="run github_repos.fetch() against an in-process server")
+    check.add_argument("--tokens", type=int, default=3)
+
+    args = parser.parse_args(argv)
+    buckets = SearchBuckets(args.limit, args.window)
+
+    if args.command == "check":
+        run_check(args.tokens, buckets)
+        return
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(buckets))
+    logger.info(
+        "GitHub stand-in on http://%s:%d (%d searches / %.0fs per token)",
+        args.host, args.port, args.limit, args.window,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
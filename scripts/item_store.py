@@ -0,0 +1,207 @@
+"""
+Binary item store: one file that can be mmap'd and queried without parsing
+every item.
+
+Layout (all integers little-endian):
+
+  header      magic b"AITS", version u16, reserved u16, item count u32,
+              then u64 offsets of the index, key blob and facet sections
+  records     per item: u32 length + compact UTF-8 JSON, in pipeline order
+  index       item count × (u32 key offset, u16 key length, u64 record offset),
+              sorted by id so lookups are a binary search
+  keys        concatenated UTF-8 ids referenced by the index
+  facets      u32 length + JSON directory {"category": {slug: [off, n]}, ...}
+              followed by the u64 record-offset arrays it points at
+
+Writer: `write_store(items, path)`. Reader: `ItemStore(path)`.
+"""
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+
+MAGIC = b"AITS"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIQQQ")
+_LEN = struct.Struct("<I")
+_INDEX_ENTRY = struct.Struct("<IHQ")
+_OFFSET = struct.Struct("<Q")
+
+# Item fields that get a per-value offset list in the facets section
+FACET_FIELDS = ("category", "source")
+
+
+def write_store(items: list[dict], path: Path) -> None:
+    """
+    Write `items` to `path` atomically (readers holding an old mmap keep
+    seeing the old file until they reopen).
+    """
+    body = bytearray()
+    offsets: list[int] = []
+    pos = _HEADER.size
+    for item in items:
+        record = json.dumps(item, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        offsets.append(pos)
+        body += _LEN.pack(len(record))
+        body += record
+        pos += _LEN.size + len(record)
+
+    # Sorted id → offset index with a separate key blob
+    keyed = sorted(
+        (item["id"].encode("utf-8"), off) for item, off in zip(items, offsets)
+    )
+    index_off = pos
+    keys_off = index_off + _INDEX_ENTRY.size * len(keyed)
+    index = bytearray()
+    keys = bytearray()
+    for key, off in keyed:
+        index += _INDEX_ENTRY.pack(len(keys), len(key), off)
+        keys += key
+
+    # Per-facet offset lists, in pipeline (score) order
+    groups: dict[str, dict[str, list[int]]] = {f: {} for f in FACET_FIELDS}
+    for item, off in zip(items, offsets):
+        for field in FACET_FIELDS:
+            value = item.get(field)
+            if value is not None:
+                groups[field].setdefault(str(value), []).append(off)
+
+    facets_off = keys_off + len(keys)
+    directory: dict[str, dict[str, list[int]]] = {f: {} for f in FACET_FIELDS}
+    arrays = bytearray()
+    # Array positions are relative to the end of the directory blob
+    for field in FACET_FIELDS:
+        for value, offs in sorted(groups[field].items()):
+            directory[field][value] = [len(arrays), len(offs)]
+            arrays += struct.pack(f"<{len(offs)}Q", *offs)
+    dir_blob = json.dumps(directory, separators=(",", ":")).encode("utf-8")
+
+    header = _HEADER.pack(
+        MAGIC, VERSION, 0, len(items), index_off, keys_off, facets_off
+    )
+
+    path = Path(path)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(body)
+        f.write(index)
+        f.write(keys)
+        f.write(_LEN.pack(len(dir_blob)))
+        f.write(dir_blob)
+        f.write(arrays)
+    os.replace(tmp, path)
+
+
+class ItemStore:
+    """
+    Read-only mmap view over a file written by `write_store`.
+
+        with ItemStore("data/items.bin") as store:
+            item = store.get("gh_owner_repo")
+            agents = list(store.by_category("ai-agents", limit=20))
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is empty, not an item store")
+        try:
+            magic, version, _, count, index_off, keys_off, facets_off = (
+                _HEADER.unpack_from(self._mm, 0)
+            )
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a v{VERSION} item store")
+            self._count = count
+            self._index_off = index_off
+            self._keys_off = keys_off
+            (dir_len,) = _LEN.unpack_from(self._mm, facets_off)
+            dir_start = facets_off + _LEN.size
+            self._facets = json.loads(self._mm[dir_start:dir_start + dir_len])
+            self._arrays_off = dir_start + dir_len
+        except Exception:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        if not self._mm.closed:
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _record(self, offset: int) -> dict:
+        (length,) = _LEN.unpack_from(self._mm, offset)
+        start = offset + _LEN.size
+        return json.loads(self._mm[start:start + length])
+
+    def _key(self, i: int) -> tuple[bytes, int]:
+        key_off, key_len, record_off = _INDEX_ENTRY.unpack_from(
+            self._mm, self._index_off + i * _INDEX_ENTRY.size
+        )
+        start = self._keys_off + key_off
+        return self._mm[start:start + key_len], record_off
+
+    def get(self, item_id: str) -> dict | None:
+        """Binary-search the id index and decode just that record."""
+        target = item_id.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key, record_off = self._key(mid)
+            if key < target:
+                lo = mid + 1
+            elif key > target:
+                hi = mid
+            else:
+                return self._record(record_off)
+        return None
+
+    def __contains__(self, item_id: str) -> bool:
+        return self.get(item_id) is not None
+
+    def ids(self):
+        """All ids in sorted order, without decoding any record."""
+        for i in range(self._count):
+            yield self._key(i)[0].decode("utf-8")
+
+    def __iter__(self):
+        """All items in pipeline (score) order."""
+        offset = _HEADER.size
+        for _ in range(self._count):
+            (length,) = _LEN.unpack_from(self._mm, offset)
+            yield self._record(offset)
+            offset += _LEN.size + length
+
+    def facet_values(self, field: str) -> dict[str, int]:
+        """Value → item count for a facet field, e.g. facet_values("source")."""
+        return {value: n for value, (_, n) in self._facets.get(field, {}).items()}
+
+    def _facet(self, field: str, value: str, limit: int | None):
+        start, count = self._facets.get(field, {}).get(value, (0, 0))
+        if limit is not None:
+            count = min(count, limit)
+        base = self._arrays_off + start
+        for i in range(count):
+            (offset,) = _OFFSET.unpack_from(self._mm, base + i * _OFFSET.size)
+            yield self._record(offset)
+
+    def by_category(self, slug: str, limit: int | None = None):
+        """Items in `slug`, in pipeline order, decoding only those records."""
+        return self._facet("category", slug, limit)
+
+    def by_source(self, source: str, limit: int | None = None):
+        """Items from `source`, in pipeline order, decoding only those records."""
+        return self._facet("source", source, limit)
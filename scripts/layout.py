@@ -0,0 +1,97 @@
+"""
+Diff-friendly output layout.
+
+The nightly bot commits its output, so the layout is built for git's delta
+storage rather than for a single read:
+
+  data/catalogue.jsonl           one item per line, sorted by id, without
+                                 the fields that change every run; an item
+                                 that didn't change keeps a byte-identical line
+  data/scores/YYYY-MM-DD.jsonl   the volatile part (rank, scores, stars,
+                                 fetched_at), one small line per item, also
+                                 id-sorted
+
+`read_catalogue` joins the two back into full items in rank order.
+"""
+import json
+from pathlib import Path
+
+from movers import overall_ranks
+
+# Fields that change between runs even when the item itself has not
+VOLATILE_FIELDS = ("fetched_at", "score", "stars", "trending_score", "normalized_score")
+
+CATALOGUE_FILE = "catalogue.jsonl"
+SCORES_DIR = "scores"
+
+
+def _line(obj) -> str:
+    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def write_catalogue(
+    items: list[dict], data_dir: Path, date: str, top: list[dict] | None = None
+) -> tuple[Path, Path]:
+    """
+    Write the stable catalogue and today's scores file. `items` must be in
+    rank order; `top` is the homepage selection, ranked first as in the
+    rank state. Returns (catalogue_path, scores_path).
+    """
+    ranked = overall_ranks(items, top)
+    by_id = sorted(items, key=lambda item: item["id"])
+
+    catalogue_path = data_dir / CATALOGUE_FILE
+    with open(catalogue_path, "w", encoding="utf-8") as f:
+        for item in by_id:
+            stable = {k: v for k, v in item.items() if k not in VOLATILE_FIELDS}
+            f.write(_line(stable) + "\n")
+
+    scores_dir = data_dir / SCORES_DIR
+    scores_dir.mkdir(exist_ok=True)
+    scores_path = scores_dir / f"{date}.jsonl"
+    with open(scores_path, "w", encoding="utf-8") as f:
+        for item in by_id:
+            volatile = {k: item.get(k) for k in VOLATILE_FIELDS}
+            volatile["id"] = item["id"]
+            volatile["rank"] = ranked[item["id"]]
+            f.write(_line(volatile) + "\n")
+
+    return catalogue_path, scores_path
+
+
+def latest_scores_path(data_dir: Path) -> Path | None:
+    paths = sorted((data_dir / SCORES_DIR).glob("????-??-??.jsonl"))
+    return paths[-1] if paths else None
+
+
+def read_catalogue(data_dir: Path) -> list[dict] | None:
+    """
+    Full items from the stable layout, in rank order, or None if the
+    layout hasn't been written. Items missing from the latest scores file
+    sort last with null scores.
+    """
+    catalogue_path = data_dir / CATALOGUE_FILE
+    scores_path = latest_scores_path(data_dir)
+    if not catalogue_path.exists() or scores_path is None:
+        return None
+
+    scores: dict[str, dict] = {}
+    with open(scores_path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                row = json.loads(line)
+                scores[row.pop("id")] = row
+
+    ranked: list[tuple[float, dict]] = []
+    with open(catalogue_path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            row = scores.get(item["id"], {})
+            for field in VOLATILE_FIELDS:
+                item.setdefault(field, row.get(field))
+            ranked.append((row.get("rank", float("inf")), item))
+
+    ranked.sort(key=lambda pair: pair[0])
+    return [item for _, item in ranked]
@@ -0,0 +1,296 @@
+"""
+Rank-movement diff between consecutive runs.
+
+Each run's ranking is kept as a compact map
+  id → [rank, score, category, category_rank]
+in a per-date state file. Today's ranking is hash-joined against the
+previous one to find risers, fallers, new entrants and drop-outs, for the
+overall top N and for each category.
+"""
+import json
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+STATE_VERSION = 1
+CATEGORY_TOP_N = 20
+MAX_ENTRIES = 25   # per list (risers, fallers, new entrants, drop-outs)
+
+
+def overall_ranks(items: list[dict], top: list[dict] | None = None) -> dict[str, int]:
+    """
+    id → overall rank. `top` is the homepage selection: its items take ranks
+    1..len(top) in its order and the rest of `items` follow in their order.
+    """
+    top = items if top is None else top
+    overall = {item["id"]: rank for rank, item in enumerate(top, start=1)}
+    rest = (item for item in items if item["id"] not in overall)
+    for rank, item in enumerate(rest, start=len(overall) + 1):
+        overall[item["id"]] = rank
+    return overall
+
+
+def rank_state(items: list[dict], date: str, top: list[dict] | None = None) -> dict:
+    """
+    Compact ranking of `items`, which must already be in rank order, with
+    overall ranks from overall_ranks(items, top). Category ranks always
+    follow `items`.
+    """
+    overall = overall_ranks(items, top)
+
+    cat_rank: dict[str, int] = {}
+    state = {}
+    for item in items:
+        cat = item.get("category", "")
+        cat_rank[cat] = cat_rank.get(cat, 0) + 1
+        state[item["id"]] = [overall[item["id"]], item.get("trending_score"), cat, cat_rank[cat]]
+    return {"version": STATE_VERSION, "date": date, "items": state}
+
+
+def load_previous_state(
+    state_dir: Path,
+    history_dir: Path,
+    before: str,
+    scores_dir: Path | None = None,
+    catalogue_path: Path | None = None,
+) -> dict | None:
+    """
+    Most recent rank state older than `before`. With `scores_dir` (stable
+    layout) the latest earlier scores file wins when it is newer: it is
+    committed, while rank states live in a cache that can be cold or stale.
+    A history snapshot is the last resort.
+    """
+    state = None
+    for path in sorted(state_dir.glob("????-??-??.json"), reverse=True):
+        if path.stem < before:
+            state = load_state(path)
+            if state:
+                break
+    if scores_dir is not None:
+        seeded = state_from_scores(scores_dir, catalogue_path, before)
+        if seeded and (state is None or seeded["date"] > state["date"]):
+            return seeded
+    return state or state_from_history(history_dir, before)
+
+
+def load_state(path: Path) -> dict | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable rank state %s: %s", path, exc)
+        return None
+    if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+        return None
+    return state
+
+
+def state_from_history(history_dir: Path, before: str) -> dict | None:
+    """
+    Fallback when no rank state exists yet: rebuild one from the most recent
+    history snapshot older than `before`. A snapshot holds only the top N,
+    so category ranks within it are meaningless; the state is marked
+    `top_only` and compute_movers leaves the category section empty.
+    """
+    candidates = sorted(
+        p for p in history_dir.glob("????-??-??.json") if p.stem < before
+    )
+    if not candidates:
+        return None
+    path = candidates[-1]
+    try:
+        with open(path, encoding="utf-8") as f:
+            items = json.load(f).get("items", [])
+    except (OSError, ValueError) as exc:
+        logger.warning("Could not read %s for rank state: %s", path, exc)
+        return None
+    state = rank_state(items, path.stem)
+    state["top_only"] = True
+    return state
+
+
+def _latest_before(directory: Path, suffix: str, before: str) -> Path | None:
+    paths = sorted(p for p in directory.glob(f"????-??-??{suffix}") if p.stem < before)
+    return paths[-1] if paths else None
+
+
+def read_scores_file(path: Path) -> list[dict]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def state_from_scores(
+    scores_dir: Path, catalogue_path: Path | None, before: str
+) -> dict | None:
+    """
+    Rank state rebuilt from the latest scores file older than `before`,
+    with categories from the catalogue it was written alongside. Category
+    ranks follow normalized score, as in the pipeline. Without a readable
+    catalogue the state is `top_only`.
+    """
+    path = _latest_before(scores_dir, ".jsonl", before)
+    if path is None:
+        return None
+    try:
+        rows = read_scores_file(path)
+    except (OSError, ValueError) as exc:
+        logger.warning("Could not read %s for rank state: %s", path, exc)
+        return None
+
+    categories: dict[str, str] = {}
+    if catalogue_path is not None:
+        try:
+            with open(catalogue_path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        item = json.loads(line)
+                        categories[item["id"]] = item.get("category", "")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as exc:
+            logger.warning("Could not read %s for rank state: %s", catalogue_path, exc)
+            categories = {}
+
+    by_score = sorted(
+        rows,
+        key=lambda r: (r.get("normalized_score") or 0.0, r.get("trending_score") or -1),
+        reverse=True,
+    )
+    cat_rank: dict[str, int] = {}
+    state = {}
+    for row in by_score:
+        cat = categories.get(row["id"], "")
+        cat_rank[cat] = cat_rank.get(cat, 0) + 1
+        state[row["id"]] = [row.get("rank"), row.get("trending_score"), cat, cat_rank[cat]]
+    seeded = {"version": STATE_VERSION, "date": path.stem, "items": state}
+    if not categories:
+        seeded["top_only"] = True
+    return seeded
+
+
+def save_state(state: dict, state_dir: Path, keep: int = 7) -> None:
+    """Write `state` as {state_dir}/{date}.json and keep the newest `keep` files."""
+    state_dir.mkdir(parents=True, exist_ok=True)
+    with open(state_dir / f"{state['date']}.json", "w", encoding="utf-8") as f:
+        json.dump(state, f, separators=(",", ":"))
+    for old in sorted(state_dir.glob("????-??-??.json"))[:-keep]:
+        old.unlink()
+
+
+def _delta(a, b):
+    if a is None or b is None:
+        return None
+    return round(a - b, 4)
+
+
+def _entry(item: dict, rank: int, prev: list | None, prev_rank: int | None) -> dict:
+    score = item.get("trending_score")
+    return {
+        "id": item["id"],
+        "title": item.get("title", ""),
+        "source": item.get("source", ""),
+        "category": item.get("category", ""),
+        "rank": rank,
+        "prev_rank": prev_rank,
+        "rank_delta": None if prev_rank is None else prev_rank - rank,
+        "score": score,
+        "score_delta": _delta(score, prev[1]) if prev else None,
+    }
+
+
+def _diff(
+    current: list[tuple[dict, int]],
+    prev_ranked: dict[str, tuple[int, list]],
+    prev_items: dict[str, list],
+    current_ids: set[str],
+) -> dict:
+    """
+    `current`: (item, rank) within the slice; `prev_ranked`: id → (rank, row)
+    for yesterday's slice. Probes yesterday's hash table with today's rows.
+    """
+    risers, fallers, entrants = [], [], []
+    for item, rank in current:
+        hit = prev_ranked.get(item["id"])
+        if hit is None:
+            entrants.append(_entry(item, rank, prev_items.get(item["id"]), None))
+            continue
+        prev_rank, row = hit
+        entry = _entry(item, rank, row, prev_rank)
+        if entry["rank_delta"] > 0:
+            risers.append(entry)
+        elif entry["rank_delta"] < 0:
+            fallers.append(entry)
+
+    in_slice = {item["id"] for item, _ in current}
+    dropouts = [
+        {
+            "id": item_id,
+            "prev_rank": prev_rank,
+            "score": row[1],
+            "still_tracked": item_id in current_ids,
+        }
+        for item_id, (prev_rank, row) in prev_ranked.items()
+        if item_id not in in_slice
+    ]
+
+    risers.sort(key=lambda e: -e["rank_delta"])
+    fallers.sort(key=lambda e: e["rank_delta"])
+    dropouts.sort(key=lambda e: e["prev_rank"])
+    return {
+        "risers": risers[:MAX_ENTRIES],
+        "fallers": fallers[:MAX_ENTRIES],
+        "new_entrants": entrants[:MAX_ENTRIES],
+        "dropouts": dropouts[:MAX_ENTRIES],
+    }
+
+
+def compute_movers(
+    items: list[dict],
+    prev_state: dict | None,
+    top: list[dict],
+    category_top_n: int = CATEGORY_TOP_N,
+) -> dict:
+    """
+    Diff today's ranking (items in rank order, `top` the homepage selection
+    as passed to rank_state) against `prev_state`. Returns the movers
+    payload; sections are empty when there is no previous state, and the
+    category section is empty when that state is `top_only`.
+    """
+    top_n = len(top)
+    if prev_state is None:
+        return {"previous_date": None, "top": _diff([], {}, {}, set()), "categories": {}}
+
+    prev_items = prev_state.get("items", {})
+    current_ids = {item["id"] for item in items}
+
+    # Build side of the hash join: yesterday's top N (per category below)
+    prev_top = {
+        item_id: (row[0], row) for item_id, row in prev_items.items() if row[0] <= top_n
+    }
+    top_ranked = [(item, rank) for rank, item in enumerate(top, start=1)]
+
+    categories = {}
+    if not prev_state.get("top_only"):
+        prev_by_cat: dict[str, dict[str, tuple[int, list]]] = {}
+        for item_id, row in prev_items.items():
+            if row[3] <= category_top_n:
+                prev_by_cat.setdefault(row[2], {})[item_id] = (row[3], row)
+
+        by_cat: dict[str, list[tuple[dict, int]]] = {}
+        for item in items:
+            cat_items = by_cat.setdefault(item.get("category", ""), [])
+            if len(cat_items) < category_top_n:
+                cat_items.append((item, len(cat_items) + 1))
+
+        categories = {
+            cat: _diff(by_cat.get(cat, []), prev_by_cat.get(cat, {}), prev_items, current_ids)
+            for cat in sorted(set(by_cat) | set(prev_by_cat))
+        }
+    return {
+        "previous_date": prev_state.get("date"),
+        "top": _diff(top_ranked, prev_top, prev_items, current_ids),
+        "categories": categories,
+    }
@@ -0,0 +1,249 @@
+"""
+Per-source score normalisation and quota-based homepage selection.
+
+Raw scores are not comparable across sources (GitHub stars reach six
+figures, HN points rarely pass a thousand, YC companies have none), so
+each item gets a `normalized_score` in [0, 1]:
+
+  - Scored sources: the mean of the item's empirical percentile and the
+    normal CDF of its z-score, both on log1p(score) and both against that
+    source's scores from today plus recent runs. The z-score part keeps
+    small samples (a dozen HN stories) from collapsing into coarse steps.
+  - YC: a prior that decays with batch age, capped at YC_PRIOR_MAX so a
+    fresh batch ranks alongside mid-table items rather than above the best.
+
+`select_top` then picks the homepage top N in one pass over the items,
+keeping one bounded heap per source, and applies per-category caps while
+merging the heaps. When the category caps exhaust the heaps, the pool is
+widened to every item before any cap is relaxed.
+"""
+import heapq
+import logging
+import math
+import re
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timezone
+from pathlib import Path
+
+from movers import load_state, read_scores_file
+
+logger = logging.getLogger(__name__)
+
+# Item id prefix → source, for rank-state rows that only carry ids
+_ID_PREFIX_SOURCE = {
+    "gh": "github",
+    "hn": "hackernews",
+    "ph": "producthunt",
+    "yc": "ycombinator",
+}
+
+HISTORY_RUNS = 7            # previous rank states folded into the statistics
+
+YC_PRIOR_MAX = 0.6
+YC_PRIOR_HALF_LIFE_YEARS = 1.5
+
+# Homepage quotas: maximum share of the top N per source / per category.
+# The source shares sum well above 1 because HN and Product Hunt often have
+# fewer items than their share; with 11 categories, 0.35 leaves room for the
+# sources whose items crowd into one or two of them.
+SOURCE_QUOTAS = {
+    "github": 0.5,
+    "hackernews": 0.3,
+    "producthunt": 0.3,
+    "ycombinator": 0.3,
+}
+DEFAULT_SOURCE_QUOTA = 0.2
+CATEGORY_MAX_SHARE = 0.35
+HEAP_SLACK = 2              # per-source heaps keep quota × slack candidates
+
+_SEASON_MONTH = {"winter": 1, "w": 1, "spring": 4, "x": 4, "summer": 6, "s": 6, "fall": 9, "f": 9}
+_BATCH_RE = re.compile(r"\b(winter|spring|summer|fall)\s+(\d{4})\b|\b([wsfx])(\d{2})\b", re.I)
+
+
+def _batch_date(text: str) -> datetime | None:
+    """'YC Winter 2012' / 'YC S24' → first month of that batch."""
+    match = _BATCH_RE.search(text or "")
+    if not match:
+        return None
+    if match.group(1):
+        season, year = match.group(1).lower(), int(match.group(2))
+    else:
+        season, year = match.group(3).lower(), 2000 + int(match.group(4))
+    return datetime(year, _SEASON_MONTH[season], 1, tzinfo=timezone.utc)
+
+
+def yc_prior(item: dict, now: datetime) -> float:
+    batch = _batch_date(item.get("author", ""))
+    if batch is None:
+        return YC_PRIOR_MAX * 0.25 if item.get("is_new") else 0.0
+    age_years = max(0.0, (now - batch).days / 365.25)
+    return YC_PRIOR_MAX * 0.5 ** (age_years / YC_PRIOR_HALF_LIFE_YEARS)
+
+
+def _source_of(item_id: str) -> str | None:
+    return _ID_PREFIX_SOURCE.get(item_id.split("_", 1)[0])
+
+
+def recent_scores(
+    state_dir: Path,
+    before: str,
+    runs: int = HISTORY_RUNS,
+    scores_dir: Path | None = None,
+) -> dict[str, list[float]]:
+    """
+    Raw scores per source from the last `runs` rank states older than
+    `before`. When the rank-state cache is cold, `scores_dir` (stable
+    layout) supplies the same numbers from the committed scores files.
+    """
+    scores: dict[str, list[float]] = {}
+
+    def add(item_id: str, raw) -> None:
+        source = _source_of(item_id)
+        if source and raw is not None:
+            scores.setdefault(source, []).append(raw)
+
+    paths = sorted(p for p in state_dir.glob("????-??-??.json") if p.stem < before)
+    for path in paths[-runs:]:
+        state = load_state(path)
+        if not state:
+            continue
+        for item_id, row in state["items"].items():
+            add(item_id, row[1])
+
+    if not scores and scores_dir is not None:
+        paths = sorted(p for p in scores_dir.glob("????-??-??.jsonl") if p.stem < before)
+        for path in paths[-runs:]:
+            try:
+                rows = read_scores_file(path)
+            except (OSError, ValueError):
+                continue
+            for row in rows:
+                add(row["id"], row.get("trending_score"))
+    return scores
+
+
+def _source_stats(values: list[float]) -> tuple[list[float], float, float]:
+    """Sorted log scores, mean and standard deviation."""
+    logs = sorted(math.log1p(max(0.0, v)) for v in values)
+    n = len(logs)
+    mean = sum(logs) / n
+    std = math.sqrt(sum((x - mean) ** 2 for x in logs) / n)
+    return logs, mean, std
+
+
+def normalize_scores(
+    items: list[dict],
+    history: dict[str, list[float]] | None = None,
+    now: datetime | None = None,
+) -> dict[str, dict]:
+    """
+    Set `normalized_score` on every item in place. Returns the per-source
+    statistics used (sample size, mean and std of log1p score).
+    """
+    now = now or datetime.now(timezone.utc)
+    history = history or {}
+
+    # Column per source: today's raw scores plus recent history
+    columns: dict[str, list[float]] = {}
+    for item in items:
+        raw = item.get("trending_score")
+        if raw is not None:
+            columns.setdefault(item["source"], []).append(raw)
+    for source, values in history.items():
+        if source in columns:
+            columns[source].extend(values)
+
+    stats = {source: _source_stats(values) for source, values in columns.items()}
+
+    for item in items:
+        raw = item.get("trending_score")
+        if raw is None or item["source"] not in stats:
+            item["normalized_score"] = (
+                round(yc_prior(item, now), 4) if item["source"] == "ycombinator" else 0.0
+            )
+            continue
+        logs, mean, std = stats[item["source"]]
+        x = math.log1p(max(0.0, raw))
+        # Mid-rank percentile, so ties share a value
+        percentile = (bisect_left(logs, x) + bisect_right(logs, x)) / (2 * len(logs))
+        z_cdf = 0.5 * (1 + math.erf((x - mean) / (std * math.sqrt(2)))) if std else 0.5
+        item["normalized_score"] = round((percentile + z_cdf) / 2, 4)
+
+    return {
+        source: {"n": len(logs), "log_mean": round(mean, 4), "log_std": round(std, 4)}
+        for source, (logs, mean, std) in stats.items()
+    }
+
+
+def select_top(
+    items: list[dict],
+    n: int,
+    source_quotas: dict[str, float] | None = None,
+    category_max_share: float = CATEGORY_MAX_SHARE,
+) -> list[dict]:
+    """
+    Top `n` items by normalized_score under per-source and per-category
+    caps. One pass fills a bounded min-heap per source; merging the heaps
+    best-first applies the category caps. If that leaves slots empty and a
+    heap dropped candidates, the items outside the heaps are merged the same
+    way. Only then are remaining slots filled without caps, with a warning.
+    """
+    quotas = SOURCE_QUOTAS if source_quotas is None else source_quotas
+
+    def source_cap(source: str) -> int:
+        return max(1, math.ceil(n * quotas.get(source, DEFAULT_SOURCE_QUOTA)))
+
+    def best_first(pos: int) -> tuple[float, int]:
+        return (-(items[pos].get("normalized_score") or 0.0), pos)
+
+    category_cap = max(1, math.ceil(n * category_max_share))
+
+    heaps: dict[str, list[tuple[float, int]]] = {}
+    truncated = False
+    for pos, item in enumerate(items):
+        heap = heaps.setdefault(item["source"], [])
+        entry = (item.get("normalized_score") or 0.0, -pos)
+        capacity = source_cap(item["source"]) * HEAP_SLACK
+        if len(heap) < capacity:
+            heapq.heappush(heap, entry)
+            continue
+        truncated = True
+        if entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    chosen: list[int] = []
+    leftovers: list[int] = []
+    per_source: dict[str, int] = {}
+    per_category: dict[str, int] = {}
+
+    def take(positions: list[int]) -> None:
+        for pos in positions:
+            if len(chosen) >= n:
+                return
+            source = items[pos]["source"]
+            cat = items[pos].get("category", "")
+            if per_source.get(source, 0) >= source_cap(source) or per_category.get(cat, 0) >= category_cap:
+                leftovers.append(pos)
+                continue
+            chosen.append(pos)
+            per_source[source] = per_source.get(source, 0) + 1
+            per_category[cat] = per_category.get(cat, 0) + 1
+
+    pooled = sorted((-neg_pos for heap in heaps.values() for _, neg_pos in heap), key=best_first)
+    take(pooled)
+
+    if len(chosen) < n and truncated:
+        in_pool = set(pooled)
+        take(sorted((p for p in range(len(items)) if p not in in_pool), key=best_first))
+
+    if len(chosen) < n and leftovers:
+        leftovers.sort(key=best_first)
+        fill = leftovers[: n - len(chosen)]
+        logger.warning(
+            "Homepage quotas left %d of %d slots empty; filled them without caps",
+            len(fill), n,
+        )
+        chosen.extend(fill)
+
+    chosen.sort(key=best_first)
+    return [items[p] for p in chosen]
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Local query service over the pipeline's output.
+
+Loads every item from data/catalogue.jsonl + the latest data/scores file when
+the stable layout exists, else from data/categories/*.json (index.json only
+holds the top N), builds in-memory secondary indexes and serves
+filter/sort/paginate queries from them, with an LRU cache of recent results.
+The data files are polled and the catalogue is rebuilt and swapped in when
+they change.
+
+  python scripts/query_server.py serve --port 8787
+  python scripts/query_server.py query --category ai-agents --is-new true --limit 5
+
+HTTP endpoints (GET, JSON):
+  /items?category=..&source=..&tool_type=..&language=..&is_new=..&tag=..
+         &sort=score|stars|created_at|title&offset=0&limit=50
+         (filters may repeat; values of one field are OR-ed, fields AND-ed)
+  /items/<id>
+  /facets
+  /health
+"""
+
+import argparse
+import json
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlparse
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from layout import CATALOGUE_FILE, latest_scores_path, read_catalogue
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+    datefmt="%Y-%m-%dT%H:%M:%S",
+)
+logger = logging.getLogger("query_server")
+
+REPO_ROOT = Path(__file__).parent.parent
+DATA_DIR = REPO_ROOT / "data"
+
+# Scalar item fields with a value → positions index
+INDEXED_FIELDS = ("category", "source", "tool_type", "language", "is_new")
+SORT_KEYS = ("score", "stars", "created_at", "title")
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+CACHE_SIZE = 256
+RELOAD_POLL_SECONDS = 2.0
+
+
+def _score(item: dict) -> tuple[float, float]:
+    # Same order as fetch_all: normalised score, then raw trending score
+    return (item.get("normalized_score") or 0.0, item.get("trending_score") or -1)
+
+
+def _index_key(value) -> str:
+    # Query strings are text, so index booleans/None the way they arrive
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return "" if value is None else str(value)
+
+
+class Catalogue:
+    """
+    Immutable snapshot of all items plus its indexes. Positions refer to
+    `items`, which is sorted by score (see _score), so any ascending position
+    list is already in score order.
+    """
+
+    def __init__(self, items: list[dict], version: tuple):
+        self.version = version
+        items = sorted(items, key=_score, reverse=True)
+        self.items = items
+        self.by_id = {item["id"]: pos for pos, item in enumerate(items)}
+
+        self.indexes: dict[str, dict[str, list[int]]] = {f: {} for f in INDEXED_FIELDS}
+        self.indexes["tag"] = {}
+        for pos, item in enumerate(items):
+            for field in INDEXED_FIELDS:
+                self.indexes[field].setdefault(_index_key(item.get(field)), []).append(pos)
+            for tag in set(item.get("tags") or []):
+                self.indexes["tag"].setdefault(str(tag).lower(), []).append(pos)
+
+        # rank[key][pos] → position of the item in that sort order
+        self.rank: dict[str, list[int]] = {}
+        orders = {
+            "stars": sorted(range(len(items)), key=lambda p: items[p].get("stars") or -1, reverse=True),
+            "created_at": sorted(range(len(items)), key=lambda p: str(items[p].get("created_at") or ""), reverse=True),
+            "title": sorted(range(len(items)), key=lambda p: (items[p].get("title") or "").lower()),
+        }
+        for key, order in orders.items():
+            rank = [0] * len(items)
+            for r, pos in enumerate(order):
+                rank[pos] = r
+            self.rank[key] = rank
+
+        self._cache: OrderedDict = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def facets(self) -> dict:
+        return {
+            field: {value: len(positions) for value, positions in index.items()}
+            for field, index in self.indexes.items()
+            if field != "tag"
+        }
+
+    def get(self, item_id: str) -> dict | None:
+        pos = self.by_id.get(item_id)
+        return None if pos is None else self.items[pos]
+
+    def _candidates(self, filters: dict[str, tuple[str, ...]]) -> list[int]:
+        if not filters:
+            return list(range(len(self.items)))
+
+        per_field = []
+        for field, values in filters.items():
+            index = self.indexes[field]
+            lists = [index.get(v, []) for v in values]
+            if len(lists) == 1:
+                per_field.append(lists[0])
+            else:
+                per_field.append(sorted(set().union(*lists)))
+
+        # Intersect starting from the most selective field
+        per_field.sort(key=len)
+        result = set(per_field[0])
+        for positions in per_field[1:]:
+            result.intersection_update(positions)
+            if not result:
+                break
+        return sorted(result)
+
+    def query(
+        self,
+        filters: dict[str, tuple[str, ...]],
+        sort: str = "score",
+        offset: int = 0,
+        limit: int = DEFAULT_LIMIT,
+    ) -> dict:
+        key = (tuple(sorted(filters.items())), sort, offset, limit)
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        positions = self._candidates(filters)
+        if sort != "score":
+            rank = self.rank[sort]
+            positions.sort(key=rank.__getitem__)
+        page = positions[offset:offset + limit]
+        result = {
+            "total": len(positions),
+            "offset": offset,
+            "limit": limit,
+            "items": [self.items[p] for p in page],
+        }
+
+        with self._cache_lock:
+            self._cache[key] = result
+            if len(self._cache) > CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return result
+
+
+def _data_files(data_dir: Path) -> list[Path]:
+    scores_path = latest_scores_path(data_dir)
+    if (data_dir / CATALOGUE_FILE).exists() and scores_path is not None:
+        return [data_dir / CATALOGUE_FILE, scores_path]
+    return sorted((data_dir / "categories").glob("*.json"))
+
+
+def _data_version(data_dir: Path) -> tuple:
+    return tuple((p.name, p.stat().st_mtime_ns, p.stat().st_size) for p in _data_files(data_dir))
+
+
+def load_catalogue(data_dir: Path) -> Catalogue:
+    version = _data_version(data_dir)
+    stable = read_catalogue(data_dir)
+    if stable is not None:
+        logger.info("Loaded %d items from %s", len(stable), data_dir / CATALOGUE_FILE)
+        return Catalogue(stable, version)
+
+    items: dict[str, dict] = {}
+    for path in _data_files(data_dir):
+        with open(path, encoding="utf-8") as f:
+            for item in json.load(f).get("items", []):
+                items[item["id"]] = item
+    logger.info("Loaded %d items from %s", len(items), data_dir)
+    return Catalogue(list(items.values()), version)
+
+
+class CatalogueHolder:
+    """Holds the current Catalogue and swaps in a new one when files change."""
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = data_dir
+        self.current = load_catalogue(data_dir)
+
+    def reload_if_changed(self) -> bool:
+        try:
+            version = _data_version(self.data_dir)
+            if version == self.current.version:
+                return False
+            self.current = load_catalogue(self.data_dir)
+            return True
+        except (OSError, ValueError) as exc:
+            # Files mid-write or malformed: keep serving the old snapshot
+            logger.warning("Reload skipped: %s", exc)
+            return False
+
+    def watch(self, interval: float = RELOAD_POLL_SECONDS) -> None:
+        def _loop():
+            while True:
+                time.sleep(interval)
+                if self.reload_if_changed():
+                    logger.info("Catalogue reloaded")
+
+        threading.Thread(target=_loop, daemon=True).start()
+
+
+def parse_query(params: dict[str, list[str]]) -> tuple[dict, str, int, int]:
+    """Validate query-string params. Raises ValueError on bad input."""
+    filters = {}
+    for field in INDEXED_FIELDS + ("tag",):
+        values = [v for raw in params.get(field, []) for v in raw.split(",") if v]
+        if values:
+            if field == "tag":
+                values = [v.lower() for v in values]
+            filters[field] = tuple(sorted(set(values)))
+
+    sort = params.get("sort", ["score"])[0]
+    if sort not in SORT_KEYS:
+        raise ValueError(f"sort must be one of {', '.join(SORT_KEYS)}")
+    offset = int(params.get("offset", ["0"])[0])
+    limit = int(params.get("limit", [str(DEFAULT_LIMIT)])[0])
+    if offset < 0 or not 0 < limit <= MAX_LIMIT:
+        raise ValueError(f"offset must be >= 0 and limit in 1..{MAX_LIMIT}")
+    return filters, sort, offset, limit
+
+
+def make_handler(holder: CatalogueHolder):
+    class Handler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body) -> None:
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            catalogue = holder.current
+            if url.path == "/health":
+                self._send(200, {"status": "ok", "items": len(catalogue.items)})
+            elif url.path == "/facets":
+                self._send(200, catalogue.facets())
+            elif url.path == "/items":
+                try:
+                    filters, sort, offset, limit = parse_query(parse_qs(url.query))
+                except ValueError as exc:
+                    self._send(400, {"error": str(exc)})
+                    return
+                self._send(200, catalogue.query(filters, sort, offset, limit))
+            elif url.path.startswith("/items/"):
+                item = catalogue.get(unquote(url.path[len("/items/"):]))
+                if item is None:
+                    self._send(404, {"error": "not found"})
+                else:
+                    self._send(200, item)
+            else:
+                self._send(404, {"error": "not found"})
+
+        def log_message(self, fmt, *args):
+            logger.debug("%s - %s", self.address_string(), fmt % args)
+
+    return Handler
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--data-dir", type=Path, default=DATA_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="run the HTTP query server")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8787)
+
+    query = sub.add_parser("query", help="run one query and print JSON")
+    for field in INDEXED_FIELDS + ("tag",):
+        query.add_argument(f"--{field.replace('_', '-')}", dest=field, action="append", default=[])
+    query.add_argument("--sort", default="score")
+    query.add_argument("--offset", default="0")
+    query.add_argument("--limit", default=str(DEFAULT_LIMIT))
+    query.add_argument("--id", help="fetch a single item by id")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        holder = CatalogueHolder(args.data_dir)
+        holder.watch()
+        server = ThreadingHTTPServer((args.host, args.port), make_handler(holder))
+        logger.info("Serving %d items on http://%s:%d", len(holder.current.items), args.host, args.port)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    catalogue = load_catalogue(args.data_dir)
+    if args.id:
+        item = catalogue.get(args.id)
+        if item is None:
+            sys.exit(f"No item with id {args.id!r}")
+        json.dump(item, sys.stdout, indent=2, ensure_ascii=False)
+    else:
+        params = {
+            field: getattr(args, field) for field in INDEXED_FIELDS + ("tag",)
+        }
+        params.update(sort=[args.sort], offset=[args.offset], limit=[args.limit])
+        try:
+            filters, sort, offset, limit = parse_query(params)
+        except ValueError as exc:
+            sys.exit(str(exc))
+        json.dump(catalogue.query(filters, sort, offset, limit), sys.stdout, indent=2, ensure_ascii=False)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+"Related tools" stage: top-k TF-IDF cosine neighbours per item.
+
+Each item becomes an L2-normalised sparse TF-IDF vector over its title,
+description and tags. Neighbours come from multiplying the matrix by its
+own transpose through an inverted index, one row at a time, keeping only
+that row's top candidates. Very common terms are dropped: they add little
+signal and dominate the cost of the product. The document-frequency cap is
+MAX_DF of the items but never more than MAX_DF_COUNT, so posting lists stay
+bounded and the product grows linearly with the catalogue.
+
+State (content hash and the top CANDIDATE_DEPTH × k scored neighbours per
+item) is kept in a JSON file. IDF is recomputed every run. When only a few
+items changed since the last run, the product is computed only for the
+changed rows and for unchanged rows that lost a stored candidate to a
+change; every other row rescores its stored candidates under today's
+vectors and merges in the changed rows' scores against it. Results can
+differ from a full build only where the IDF shift lifts an item from
+outside a row's stored candidates into its top k. A full build runs
+whenever more than REBUILD_FRACTION of items changed.
+"""
+import hashlib
+import heapq
+import json
+import logging
+import math
+import re
+from collections import Counter
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+TOP_K = 5
+MIN_SIMILARITY = 0.1
+MAX_DF = 0.05            # drop terms present in more than 5% of items...
+MAX_DF_COUNT = 200       # ...or in more than this many, whichever is lower
+CANDIDATE_DEPTH = 3      # neighbours kept in state per item, as a multiple of k
+REBUILD_FRACTION = 0.2   # full rebuild when more than this share of items changed
+STATE_VERSION = 2
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.-]*[a-z0-9+#]|[a-z0-9]{2,}")
+
+_STOPWORDS = frozenset(
+    """
+    a an and are as at be by for from has have in into is it its of on or our
+    that the their this to was we with you your can will all any more most
+    use using used new based via not no but so than then them they which who
+    what how when where while also about over out up one two make makes
+    """.split()
+)
+
+
+def _tokens(item: dict) -> list[str]:
+    text = " ".join(
+        [
+            item.get("title", "") or "",
+            item.get("description", "") or "",
+            " ".join(item.get("tags", []) or []),
+        ]
+    ).lower()
+    return [t for t in _TOKEN_RE.findall(text) if t not in _STOPWORDS]
+
+
+def _content_hash(tokens: list[str]) -> str:
+    return hashlib.blake2b(" ".join(tokens).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _build_idf(token_lists: list[list[str]]) -> dict[str, float]:
+    n = len(token_lists)
+    df = Counter(t for tokens in token_lists for t in set(tokens))
+    max_df = max(2, min(int(n * MAX_DF), MAX_DF_COUNT))
+    # Terms seen once can't link two items, so they are left out as well
+    return {
+        term: math.log((1 + n) / (1 + count)) + 1.0
+        for term, count in df.items()
+        if 2 <= count <= max_df
+    }
+
+
+def _vectorize(tokens: list[str], idf: dict[str, float]) -> dict[str, float]:
+    tf = Counter(t for t in tokens if t in idf)
+    vec = {t: (1.0 + math.log(c)) * idf[t] for t, c in tf.items()}
+    norm = math.sqrt(sum(w * w for w in vec.values()))
+    if not norm:
+        return {}
+    return {t: w / norm for t, w in vec.items()}
+
+
+def _dot(a: dict[str, float], b: dict[str, float]) -> float:
+    if len(b) < len(a):
+        a, b = b, a
+    return sum(w * b[t] for t, w in a.items() if t in b)
+
+
+def _postings(vectors: list[dict[str, float]]) -> dict[str, list[tuple[int, float]]]:
+    index: dict[str, list[tuple[int, float]]] = {}
+    for col, vec in enumerate(vectors):
+        for term, weight in vec.items():
+            index.setdefault(term, []).append((col, weight))
+    return index
+
+
+def _multiply_rows(
+    rows: list[int],
+    vectors: list[dict[str, float]],
+    postings: dict[str, list[tuple[int, float]]],
+    k: int,
+) -> dict[int, list[tuple[float, int]]]:
+    """
+    Sparse product of `rows` against every column, one row at a time.
+    Returns row → top-k (score, col) with self-matches removed.
+    """
+    top: dict[int, list[tuple[float, int]]] = {}
+    for row in rows:
+        acc: dict[int, float] = {}
+        for term, weight in vectors[row].items():
+            for col, other in postings.get(term, ()):
+                acc[col] = acc.get(col, 0.0) + weight * other
+        acc.pop(row, None)
+        top[row] = heapq.nlargest(
+            k,
+            ((score, col) for col, score in acc.items() if score >= MIN_SIMILARITY),
+        )
+    return top
+
+def _load_state(path: Path) -> dict | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable related-items state %s: %s", path, exc)
+        return None
+    if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+        return None
+    return state
+
+
+def add_related(items: list[dict], state_path: Path, k: int = TOP_K) -> list[dict]:
+    """
+    Set `related_ids` (up to k ids, most similar first) on every item in
+    place and persist the state for the next run. Returns the same list.
+    """
+    # Columns follow id order, so score ties break the same way on every run
+    # regardless of the order items arrive in
+    ordered = sorted(items, key=lambda item: item["id"])
+    token_lists = [_tokens(item) for item in ordered]
+    hashes = [_content_hash(tokens) for tokens in token_lists]
+    ids = [item["id"] for item in ordered]
+    col_of = {item_id: col for col, item_id in enumerate(ids)}
+
+    state = _load_state(state_path)
+    prev = state["items"] if state else {}
+    changed = [
+        col for col, item_id in enumerate(ids)
+        if prev.get(item_id, {}).get("hash") != hashes[col]
+    ]
+    removed = set(prev) - set(ids)
+    incremental = (
+        state is not None
+        and len(changed) + len(removed) <= REBUILD_FRACTION * max(1, len(items))
+    )
+
+    idf = _build_idf(token_lists)
+    vectors = [_vectorize(tokens, idf) for tokens in token_lists]
+    postings = _postings(vectors)
+    depth = k * CANDIDATE_DEPTH
+
+    if not incremental:
+        top = _multiply_rows(list(range(len(items))), vectors, postings, depth)
+    else:
+        stale = {ids[c] for c in changed} | removed
+        changed_set = set(changed)
+        # Unchanged rows that lost a stored candidate are recomputed in full,
+        # so their lists are refilled rather than left to shrink
+        refill = [
+            col for col, item_id in enumerate(ids)
+            if col not in changed_set
+            and any(other in stale for other, _ in prev[item_id]["related"])
+        ]
+        top = _multiply_rows(changed + refill, vectors, postings, depth)
+        done = changed_set.union(refill)
+
+        # Similarity is symmetric: a changed row's scores are also the
+        # unchanged items' scores against it.
+        incoming: dict[int, list[tuple[float, int]]] = {}
+        for row in changed:
+            acc: dict[int, float] = {}
+            for term, weight in vectors[row].items():
+                for col, other in postings.get(term, ()):
+                    if col not in done:
+                        acc[col] = acc.get(col, 0.0) + weight * other
+            for col, score in acc.items():
+                if score >= MIN_SIMILARITY:
+                    incoming.setdefault(col, []).append((score, row))
+
+        for col, item_id in enumerate(ids):
+            if col in done:
+                continue
+            rescored = []
+            for other, _ in prev[item_id]["related"]:
+                score = _dot(vectors[col], vectors[col_of[other]])
+                if score >= MIN_SIMILARITY:
+                    rescored.append((score, col_of[other]))
+            top[col] = heapq.nlargest(depth, rescored + incoming.get(col, []))
+
+    new_items = {}
+    for col, item in enumerate(ordered):
+        neighbours = top.get(col, [])
+        item["related_ids"] = [ids[other] for _, other in neighbours[:k]]
+        new_items[ids[col]] = {
+            "hash": hashes[col],
+            "related": [[ids[other], round(score, 6)] for score, other in neighbours],
+        }
+
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(state_path, "w", encoding="utf-8") as f:
+        json.dump({"version": STATE_VERSION, "items": new_items}, f)
+
+    logger.info(
+        "Related items: %s over %d items (%d changed, %d removed, %d terms)",
+        "incremental update" if incremental else "full build",
+        len(items), len(changed), len(removed), len(idf),
+    )
+    return items
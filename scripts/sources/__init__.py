@@ -1 +1,123 @@
 # Sources package
+"""
+Source registry. Each entry declares:
+  name          id used in item["source"] and on the command line
+  label         heading for logs
+  module        module in this package; imported only when the source runs
+  fetch         name of the fetch callable in that module
+  cadence       "daily" or "weekly" (weekly sources run on Mondays unless
+                selected explicitly)
+  requires_env  groups of env vars; the source runs if any one group is
+                fully set (empty list = no requirement)
+  enabled       False keeps the source out of default runs
+
+Adding a source means adding a module and an entry here; fetch_all needs
+no changes.
+"""
+import importlib
+import logging
+import os
+from datetime import date
+
+logger = logging.getLogger(__name__)
+
+SOURCES = [
+    {
+        "name": "github",
+        "label": "GitHub Repos",
+        "module": "github_repos",
+        "fetch": "fetch",
+        "cadence": "daily",
+        "requires_env": [],
+        "enabled": True,
+    },
+    {
+        "name": "hackernews",
+        "label": "Hacker News",
+        "module": "hackernews",
+        "fetch": "fetch",
+        "cadence": "daily",
+        "requires_env": [],
+        "enabled": True,
+    },
+    {
+        "name": "producthunt",
+        "label": "Product Hunt",
+        "module": "producthunt",
+        "fetch": "fetch",
+        "cadence": "daily",
+        "requires_env": [
+            ["PRODUCT_HUNT_TOKEN"],
+            ["PRODUCT_HUNT_CLIENT_ID", "PRODUCT_HUNT_CLIENT_SECRET"],
+        ],
+        "enabled": True,
+    },
+    {
+        "name": "ycombinator",
+        "label": "YCombinator",
+        "module": "ycombinator",
+        "fetch": "fetch",
+        "cadence": "daily",
+        "requires_env": [],
+        "enabled": True,
+    },
+    {
+        "name": "twitter",
+        "label": "Twitter/X",
+        "module": "twitter",
+        "fetch": "fetch",
+        "cadence": "daily",
+        "requires_env": [["TWITTER_BEARER_TOKEN"]],
+        "enabled": False,  # see sources/twitter.py
+    },
+]
+
+_BY_NAME = {source["name"]: source for source in SOURCES}
+
+
+def get_source(name: str) -> dict:
+    """Registry entry for `name`. Raises KeyError for unknown sources."""
+    try:
+        return _BY_NAME[name]
+    except KeyError:
+        raise KeyError(
+            f"Unknown source {name!r}. Known: {', '.join(_BY_NAME)}"
+        ) from None
+
+
+def has_required_env(source: dict) -> bool:
+    groups = source["requires_env"]
+    return not groups or any(all(os.environ.get(var) for var in group) for group in groups)
+
+
+def is_due(source: dict, today: date) -> bool:
+    if source["cadence"] == "weekly":
+        return today.weekday() == 0
+    return True
+
+
+def select_sources(names: list[str] | None, today: date) -> list[dict]:
+    """
+    Sources to run. Explicit `names` bypass `enabled` and cadence; otherwise
+    every enabled source that is due today.
+    """
+    if names:
+        return [get_source(name) for name in names]
+    return [s for s in SOURCES if s["enabled"] and is_due(s, today)]
+
+
+def run_source(source: dict) -> list[dict]:
+    """Import the source module lazily and call its fetch; failures are isolated."""
+    if not has_required_env(source):
+        logger.warning(
+            "Skipping %s: none of the required env var sets are configured (%s)",
+            source["name"],
+            " or ".join("+".join(group) for group in source["requires_env"]),
+        )
+        return []
+    try:
+        module = importlib.import_module(f"{__name__}.{source['module']}")
+        return getattr(module, source["fetch"])()
+    except Exception as exc:
+        logger.error("Source %s failed: %s", source["name"], exc)
+        return []
@@ -1,29 +1,100 @@
 """
 GitHub Search API fetcher.
 Discovers new AI repos created in the last 24 hours + trending repos from the last week.
-Authenticated search limit: 30 req/min. We sleep 2.5s between queries (~17 queries).
+Authenticated search limit: 30 req/min per token.
+
+Tokens come from GITHUB_TOKENS (comma-separated) plus GITHUB_TOKEN. Each
+token gets a worker thread that pulls queries from a shared queue, so the
+query list is sharded across tokens on demand. Every worker tracks its own
+token's search budget from the X-RateLimit-* response headers, spacing
+requests over the reset window and handing queries back to the queue
+rather than waiting out a long reset. Each extra token adds
+QUERIES_PER_TOKEN of EXTENDED_QUERIES to the run.
+
+GITHUB_API_URL (set by GitHub Actions) can point the fetcher at a local
+stand-in server for testing; see scripts/github_standin.py.
 """
 import os
 import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
-import sys
-import pathlib
-sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
-from utils import safe_get, check_github_rate_limit, rate_limit_sleep
+import requests
+
+from utils import safe_get_response, rate_limit_sleep
 
 logger = logging.getLogger(__name__)
 
-GITHUB_SEARCH_API = "https://api.github.com/search/repositories"
+GITHUB_API_URL = os.environ.get("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+GITHUB_SEARCH_API = f"{GITHUB_API_URL}/search/repositories"
+GITHUB_RATE_LIMIT_API = f"{GITHUB_API_URL}/rate_limit"
 
+QUERIES_PER_TOKEN = 17     # what one token covers comfortably per nightly run
+MIN_INTERVAL = 2.0         # seconds between requests on the same token
+SEARCH_RESERVE = 1         # leave this many search calls unused per window
+MAX_RESET_WAIT = 90        # longer waits hand the query back to other tokens
 
-def _headers() -> dict:
-    token = os.environ.get("GITHUB_TOKEN", "")
-    return {
-        "Authorization": f"Bearer {token}",
+
+def _tokens() -> list[str]:
+    tokens = [t.strip() for t in os.environ.get("GITHUB_TOKENS", "").split(",") if t.strip()]
+    single = os.environ.get("GITHUB_TOKEN", "")
+    if single and single not in tokens:
+        tokens.append(single)
+    return tokens
+
+
+def _headers(token: str) -> dict:
+    headers = {
         "Accept": "application/vnd.github+json",
         "X-GitHub-Api-Version": "2022-11-28",
     }
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+class _TokenBudget:
+    """Search budget of one token, as last reported by GitHub."""
+
+    def __init__(self, token: str, label: str):
+        self.token = token
+        self.label = label
+        self.remaining: int | None = None
+        self.reset = 0.0
+        self.last_request = 0.0
+
+    def seed(self) -> None:
+        """Read the search bucket from /rate_limit (free of charge)."""
+        try:
+            data = requests.get(
+                GITHUB_RATE_LIMIT_API, headers=_headers(self.token), timeout=10
+            ).json()
+            search = data["resources"]["search"]
+            self.remaining = int(search["remaining"])
+            self.reset = float(search["reset"])
+        except Exception as exc:
+            logger.warning("Could not read rate limit for %s: %s", self.label, exc)
+
+    def update(self, headers) -> None:
+        try:
+            self.remaining = int(headers["X-RateLimit-Remaining"])
+            self.reset = float(headers["X-RateLimit-Reset"])
+        except (KeyError, TypeError, ValueError):
+            pass
+
+    def wait_time(self, now: float) -> float:
+        """Seconds to wait before this token's next search request."""
+        window = self.reset - now
+        if self.remaining is not None and self.remaining <= SEARCH_RESERVE:
+            return max(0.0, window + 1) if window > 0 else 0.0
+        spacing = MIN_INTERVAL
+        if self.remaining and window > 0:
+            # Spread what's left evenly over the rest of the window
+            spacing = max(MIN_INTERVAL, window / (self.remaining - SEARCH_RESERVE))
+        return max(0.0, self.last_request + spacing - now)
 
 
 # New repos from the last 24 hours — each query uses a different AI topic tag
@@ -51,54 +122,159 @@ TRENDING_QUERIES = [
     "topic:generative-ai pushed:>{week_ago} stars:>200",
 ]
 
+# Extra coverage unlocked by additional tokens, QUERIES_PER_TOKEN per token
+EXTENDED_QUERIES = [
+    "topic:mcp created:>{date} stars:>5",
+    "topic:model-context-protocol created:>{date} stars:>5",
+    "topic:llama created:>{date} stars:>5",
+    "topic:openai created:>{date} stars:>5",
+    "topic:chatgpt created:>{date} stars:>5",
+    "topic:prompt-engineering created:>{date} stars:>5",
+    "topic:multimodal created:>{date} stars:>5",
+    "topic:computer-vision created:>{date} stars:>20",
+    "topic:nlp created:>{date} stars:>20",
+    "topic:transformers created:>{date} stars:>10",
+    "topic:embeddings created:>{date} stars:>5",
+    "topic:fine-tuning created:>{date} stars:>5",
+    "topic:llm-inference created:>{date} stars:>5",
+    "topic:text-to-speech created:>{date} stars:>5",
+    "topic:text-to-video created:>{date} stars:>5",
+    "topic:mlops created:>{date} stars:>10",
+    "topic:robotics topic:ai created:>{date} stars:>5",
+    "topic:llm language:rust created:>{date} stars:>5",
+    "topic:llm language:go created:>{date} stars:>5",
+    "topic:llm language:typescript created:>{date} stars:>5",
+    "topic:rag pushed:>{week_ago} stars:>200",
+    "topic:mcp pushed:>{week_ago} stars:>200",
+    "topic:local-llm pushed:>{week_ago} stars:>100",
+    "topic:llm-inference pushed:>{week_ago} stars:>200",
+    "topic:computer-vision pushed:>{week_ago} stars:>500",
+    "topic:text-to-image pushed:>{week_ago} stars:>200",
+    "topic:speech-recognition pushed:>{week_ago} stars:>200",
+    "topic:vector-database pushed:>{week_ago} stars:>200",
+]
 
-def fetch() -> list[dict]:
-    token = os.environ.get("GITHUB_TOKEN", "")
-    if token:
-        check_github_rate_limit(token)
 
-    yesterday = (datetime.now(timezone.utc) - timedelta(days=1)).strftime("%Y-%m-%d")
-    week_ago = (datetime.now(timezone.utc) - timedelta(days=7)).strftime("%Y-%m-%d")
-    now_iso = datetime.now(timezone.utc).isoformat()
+def _to_item(repo: dict, yesterday: str, now_iso: str) -> dict:
+    return {
+        "id": f"gh_{repo['full_name'].replace('/', '_')}",
+        "source": "github",
+        "title": repo["name"],
+        "description": repo.get("description"),
+        "url": repo["html_url"],
+        "author": repo["owner"]["login"],
+        "stars": repo["stargazers_count"],
+        "score": repo["stargazers_count"],
+        "tags": repo.get("topics", []),
+        "language": repo.get("language"),
+        "created_at": repo["created_at"],
+        "fetched_at": now_iso,
+        "thumbnail_url": None,
+        "is_new": repo["created_at"][:10] >= yesterday,
+        "trending_score": float(repo["stargazers_count"]),
+    }
 
-    results: dict[str, dict] = {}
 
-    all_queries = NEW_REPO_QUERIES + TRENDING_QUERIES
-    for query_template in all_queries:
-        query = query_template.format(date=yesterday, week_ago=week_ago)
+def _worker(
+    budget: _TokenBudget,
+    pending: "queue.Queue[str]",
+    results: dict[str, dict],
+    lock: threading.Lock,
+    yesterday: str,
+    now_iso: str,
+) -> int:
+    """Run queries from `pending` on one token until the queue is empty."""
+    budget.seed()
+    done = 0
+    while True:
+        try:
+            query = pending.get_nowait()
+        except queue.Empty:
+            return done
+
+        wait = budget.wait_time(time.time())
+        if wait > MAX_RESET_WAIT:
+            logger.warning(
+                "%s exhausted until reset in %.0fs; leaving queries to other tokens",
+                budget.label, wait,
+            )
+            pending.put(query)
+            return done
+        if wait:
+            rate_limit_sleep(wait)
+
         params = {
             "q": query,
             "sort": "stars",
             "order": "desc",
             "per_page": 30,
         }
+        budget.last_request = time.time()
         try:
-            data = safe_get(GITHUB_SEARCH_API, headers=_headers(), params=params)
-            for repo in data.get("items", []):
-                repo_id = f"gh_{repo['full_name'].replace('/', '_')}"
-                if repo_id in results:
-                    continue
-                results[repo_id] = {
-                    "id": repo_id,
-                    "source": "github",
-                    "title": repo["name"],
-                    "description": repo.get("description"),
-                    "url": repo["html_url"],
-                    "author": repo["owner"]["login"],
-                    "stars": repo["stargazers_count"],
-                    "score": repo["stargazers_count"],
-                    "tags": repo.get("topics", []),
-                    "language": repo.get("language"),
-                    "created_at": repo["created_at"],
-                    "fetched_at": now_iso,
-                    "thumbnail_url": None,
-                    "is_new": repo["created_at"][:10] >= yesterday,
-                    "trending_score": float(repo["stargazers_count"]),
-                }
+            resp = safe_get_response(
+                GITHUB_SEARCH_API, headers=_headers(budget.token), params=params
+            )
+            budget.update(resp.headers)
+            repos = resp.json().get("items", [])
+            with lock:
+                for repo in repos:
+                    repo_id = f"gh_{repo['full_name'].replace('/', '_')}"
+                    if repo_id not in results:
+                        results[repo_id] = _to_item(repo, yesterday, now_iso)
+            done += 1
         except Exception as exc:
-            logger.error("GitHub query failed for '%s': %s", query, exc)
+            response = getattr(exc, "response", None)
+            if response is not None:
+                budget.update(response.headers)
+            logger.error("GitHub query failed for '%s' on %s: %s", query, budget.label, exc)
+
 
-        rate_limit_sleep(2.5)  # Stay safely under 30 req/min
+def fetch() -> list[dict]:
+    tokens = _tokens()
+    if not tokens:
+        logger.warning("No GITHUB_TOKEN(S) set; using the unauthenticated search limit")
+    budgets = [
+        _TokenBudget(token, f"token {i + 1}/{len(tokens)}")
+        for i, token in enumerate(tokens)
+    ] or [_TokenBudget("", "anonymous")]
+
+    yesterday = (datetime.now(timezone.utc) - timedelta(days=1)).strftime("%Y-%m-%d")
+    week_ago = (datetime.now(timezone.utc) - timedelta(days=7)).strftime("%Y-%m-%d")
+    now_iso = datetime.now(timezone.utc).isoformat()
+
+    base_queries = NEW_REPO_QUERIES + TRENDING_QUERIES
+    extra = max(0, QUERIES_PER_TOKEN * len(budgets) - len(base_queries))
+    all_queries = base_queries + EXTENDED_QUERIES[:extra]
+
+    pending: "queue.Queue[str]" = queue.Queue()
+    for query_template in all_queries:
+        pending.put(query_template.format(date=yesterday, week_ago=week_ago))
+
+    results: dict[str, dict] = {}
+    lock = threading.Lock()
+    completed = 0
+    active = budgets
+    while active:
+        with ThreadPoolExecutor(max_workers=len(active)) as pool:
+            futures = [
+                pool.submit(_worker, budget, pending, results, lock, yesterday, now_iso)
+                for budget in active
+            ]
+            completed += sum(f.result() for f in futures)
+        if pending.empty():
+            break
+        # An exhausted worker may have handed a query back after the others
+        # had already found the queue empty and exited; rerun the tokens
+        # that can still search soon enough.
+        now = time.time()
+        active = [b for b in budgets if b.wait_time(now) <= MAX_RESET_WAIT]
 
-    logger.info("GitHub: fetched %d unique repos", len(results))
+    if not pending.empty():
+        logger.warning(
+            "GitHub: %d queries left unrun, every token was exhausted", pending.qsize()
+        )
+    logger.info(
+        "GitHub: fetched %d unique repos from %d/%d queries across %d token(s)",
+        len(results), completed, len(all_queries), len(budgets),
+    )
     return list(results.values())
@@ -1,13 +1,18 @@
 """
 Hacker News fetcher via the Algolia search API.
 Free, no auth required. Returns stories from the last 36 hours with score >= 10.
+
+Two modes, selected with HN_FETCH_MODE:
+  - "combined" (default): scans the whole 36h window with points>=MIN_SCORE
+    applied server-side, paginating until the window is exhausted, and matches
+    AI_QUERIES locally. Usually one or two requests in total.
+  - "per-query": the original one-request-per-query search (30 hits each).
 """
+import os
+import re
 import logging
 from datetime import datetime, timedelta, timezone
 
-import sys
-import pathlib
-sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
 from utils import safe_get, rate_limit_sleep
 
 logger = logging.getLogger(__name__)
@@ -36,8 +41,157 @@ AI_QUERIES = [
 
 MIN_SCORE = 10  # Filter out low-engagement stories
 
+# Algolia caps hitsPerPage at 1000 and only serves the first 1000 hits of a
+# result set (paginationLimitedTo), so deep windows are walked by moving the
+# created_at_i upper bound instead of the page number.
+COMBINED_HITS_PER_PAGE = 1000
+ALGOLIA_PAGINATION_LIMIT = 1000
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Qualifier words that only disambiguate a query for Algolia; like its
+# optionalWords setting, a story matches without them ("Claude" alone is
+# enough for "Claude AI").
+OPTIONAL_WORDS = {
+    "Claude AI": {"ai"},
+    "Gemini AI": {"ai"},
+    "AI agent": {"ai"},
+    "computer vision AI": {"ai"},
+}
+
+
+def _query_terms(query: str) -> tuple[frozenset[str], str]:
+    """
+    (words that must appear whole, word that must begin some word of the story).
+    Algolia treats the last query word as a prefix, so "LLM" also finds
+    "LLMs" and "agent" finds "agents".
+    """
+    optional = OPTIONAL_WORDS.get(query, set())
+    words = [w for w in _WORD_RE.findall(query.lower()) if w not in optional]
+    return frozenset(words[:-1]), words[-1]
+
+
+_QUERY_TERMS = [_query_terms(q) for q in AI_QUERIES]
+
+
+def _to_item(hit: dict, now_iso: str) -> dict:
+    url = hit.get("url") or (
+        f"https://news.ycombinator.com/item?id={hit['objectID']}"
+    )
+    return {
+        "id": f"hn_{hit['objectID']}",
+        "source": "hackernews",
+        "title": hit.get("title", ""),
+        "description": None,
+        "url": url,
+        "author": hit.get("author", ""),
+        "stars": None,
+        "score": hit.get("points", 0),
+        "tags": [],
+        "language": None,
+        "created_at": hit.get("created_at", ""),
+        "fetched_at": now_iso,
+        "thumbnail_url": None,
+        "is_new": True,
+        "trending_score": float(hit.get("points") or 0),
+    }
+
+
+def _matches_ai_query(hit: dict) -> bool:
+    """
+    Local stand-in for Algolia's query matching: a hit matches a query when
+    every required word of the query appears in its title, URL or story
+    text, the last one as a prefix.
+    """
+    text = " ".join(
+        [hit.get("title") or "", hit.get("url") or "", hit.get("story_text") or ""]
+    ).lower()
+    words = set(_WORD_RE.findall(text))
+    return any(
+        exact <= words and any(w.startswith(prefix) for w in words)
+        for exact, prefix in _QUERY_TERMS
+    )
+
+
+def _iter_window_hits(since_ts: int):
+    """
+    Yield every story created after `since_ts` with points >= MIN_SCORE,
+    newest first, deduplicated by objectID as pages stream in.
+    """
+    seen: set[str] = set()
+    until_ts = None
+
+    while True:
+        numeric = [f"created_at_i>{since_ts}", f"points>={MIN_SCORE}"]
+        if until_ts is not None:
+            numeric.append(f"created_at_i<={until_ts}")
+
+        page = 0
+        oldest_ts = None
+        while True:
+            params = {
+                "tags": "story",
+                "numericFilters": ",".join(numeric),
+                "hitsPerPage": COMBINED_HITS_PER_PAGE,
+                "page": page,
+            }
+            data = safe_get(HN_SEARCH_API, params=params)
+            hits = data.get("hits", [])
+            for hit in hits:
+                created = hit.get("created_at_i")
+                if created is not None:
+                    oldest_ts = created if oldest_ts is None else min(oldest_ts, created)
+                object_id = hit.get("objectID")
+                if not object_id or object_id in seen:
+                    continue
+                seen.add(object_id)
+                yield hit
+
+            page += 1
+            served = page * COMBINED_HITS_PER_PAGE
+            if not hits or page >= data.get("nbPages", 0) or served >= ALGOLIA_PAGINATION_LIMIT:
+                break
+            rate_limit_sleep(0.5)
+
+        # Done once the window fitted inside Algolia's pagination limit, or
+        # when there is nothing older left to slide the upper bound towards.
+        if data.get("nbHits", 0) <= served or oldest_ts is None or oldest_ts == until_ts:
+            return
+        until_ts = oldest_ts
+        rate_limit_sleep(0.5)
+
+
+def fetch_combined() -> list[dict]:
+    since_ts = int(
+        (datetime.now(timezone.utc) - timedelta(hours=36)).timestamp()
+    )
+    now_iso = datetime.now(timezone.utc).isoformat()
+    results: dict[str, dict] = {}
+
+    scanned = 0
+    try:
+        for hit in _iter_window_hits(since_ts):
+            scanned += 1
+            if _matches_ai_query(hit):
+                item = _to_item(hit, now_iso)
+                results[item["id"]] = item
+    except Exception as exc:
+        logger.error("HN window scan failed after %d hits: %s", scanned, exc)
+
+    logger.info(
+        "HN: fetched %d AI stories out of %d scanned (score >= %d)",
+        len(results), scanned, MIN_SCORE,
+    )
+    return list(results.values())
+
 
 def fetch() -> list[dict]:
+    if os.environ.get("HN_FETCH_MODE", "combined") == "combined":
+        return fetch_combined()
+    return fetch_per_query()
+
+
+def fetch_per_query() -> list[dict]:
     since_ts = int(
         (datetime.now(timezone.utc) - timedelta(hours=36)).timestamp()
     )
@@ -57,26 +211,7 @@ def fetch() -> list[dict]:
                 item_id = f"hn_{hit['objectID']}"
                 if item_id in results:
                     continue
-                url = hit.get("url") or (
-                    f"https://news.ycombinator.com/item?id={hit['objectID']}"
-                )
-                results[item_id] = {
-                    "id": item_id,
-                    "source": "hackernews",
-                    "title": hit.get("title", ""),
-                    "description": None,
-                    "url": url,
-                    "author": hit.get("author", ""),
-                    "stars": None,
-                    "score": hit.get("points", 0),
-                    "tags": [],
-                    "language": None,
-                    "created_at": hit.get("created_at", ""),
-                    "fetched_at": now_iso,
-                    "thumbnail_url": None,
-                    "is_new": True,
-                    "trending_score": float(hit.get("points") or 0),
-                }
+                results[item_id] = _to_item(hit, now_iso)
         except Exception as exc:
             logger.error("HN query failed for '%s': %s", query, exc)
 
@@ -2,10 +2,17 @@
 Product Hunt GraphQL API fetcher.
 Requires PRODUCT_HUNT_TOKEN (developer token) in environment.
 Fetches AI-tagged posts from the last 2 days, ordered by votes.
+
+By default the window is split into time slices that are fetched
+concurrently, each one following pageInfo.endCursor until exhausted, with
+the page size adapted to the complexity budget reported in the rate-limit
+headers. Set PH_FETCH_MODE=single for the original one-request fetch.
 """
 import os
 import logging
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta, timezone
 
 logger = logging.getLogger(__name__)
@@ -38,6 +45,90 @@ query($postedAfter: DateTime, $first: Int) {
 }
 """
 
+# Only the fields the item schema needs; topics are capped to keep each node
+# cheap in complexity points.
+PAGED_POSTS_QUERY = """
+query($postedAfter: DateTime, $postedBefore: DateTime, $first: Int, $after: String) {
+  posts(
+    order: VOTES,
+    postedAfter: $postedAfter,
+    postedBefore: $postedBefore,
+    topic: "artificial-intelligence",
+    first: $first,
+    after: $after
+  ) {
+    pageInfo { endCursor hasNextPage }
+    edges {
+      node {
+        id
+        name
+        tagline
+        url
+        votesCount
+        createdAt
+        thumbnail { url }
+        topics(first: 5) { edges { node { slug } } }
+        user { username }
+      }
+    }
+  }
+}
+"""
+
+WINDOW_DAYS = 2
+WINDOW_SLICES = 4          # concurrent time slices across the window
+MAX_PAGE_SIZE = 20         # the API never returns more than 20 posts per page
+MIN_PAGE_SIZE = 5
+COST_PER_POST = 9          # rough complexity points per post node (post + thumbnail + topics + user)
+BUDGET_RESERVE = 0.2       # keep this fraction of the complexity budget unused
+MAX_PAGES_PER_SLICE = 25   # hard stop against runaway cursors
+
+
+class _Budget:
+    """
+    Tracks the complexity budget reported by the X-Rate-Limit-* headers and
+    sizes the next page so concurrent slices never spend past the reserve.
+    """
+
+    def __init__(self, slices: int):
+        self._lock = threading.Lock()
+        self.active = slices
+        self.limit = None
+        self.remaining = None
+        self.reset = None
+
+    def update(self, headers) -> None:
+        def _int(name):
+            try:
+                return int(headers.get(name))
+            except (TypeError, ValueError):
+                return None
+
+        with self._lock:
+            limit = _int("X-Rate-Limit-Limit")
+            remaining = _int("X-Rate-Limit-Remaining")
+            if limit is not None:
+                self.limit = limit
+            if remaining is not None:
+                self.remaining = remaining
+            self.reset = _int("X-Rate-Limit-Reset") or self.reset
+
+    def finish_slice(self) -> None:
+        with self._lock:
+            self.active = max(1, self.active - 1)
+
+    def page_size(self) -> int:
+        """Largest page the remaining budget allows, or 0 to stop."""
+        with self._lock:
+            if self.remaining is None:
+                return MAX_PAGE_SIZE
+            reserve = int((self.limit or self.remaining) * BUDGET_RESERVE)
+            spendable = self.remaining - reserve
+            size = spendable // (COST_PER_POST * self.active)
+        if size < MIN_PAGE_SIZE:
+            return 0
+        return min(MAX_PAGE_SIZE, size)
+
 
 def _get_token() -> str:
     """Return developer token or attempt client-credentials flow."""
@@ -67,7 +158,147 @@ def _get_token() -> str:
     return ""
 
 
+def _to_item(node: dict, now_iso: str) -> dict:
+    topic_slugs = [
+        t.get("node", {}).get("slug", "")
+        for t in node.get("topics", {}).get("edges", [])
+        if t.get("node", {}).get("slug")
+    ]
+    thumbnail_url = None
+    if node.get("thumbnail"):
+        thumbnail_url = node["thumbnail"].get("url")
+
+    return {
+        "id": f"ph_{node['id']}",
+        "source": "producthunt",
+        "title": node.get("name", ""),
+        "description": node.get("tagline", ""),
+        "url": node.get("url", ""),
+        "author": (node.get("user") or {}).get("username", ""),
+        "stars": None,
+        "score": node.get("votesCount", 0),
+        "tags": topic_slugs,
+        "language": None,
+        "created_at": node.get("createdAt", ""),
+        "fetched_at": now_iso,
+        "thumbnail_url": thumbnail_url,
+        "is_new": True,
+        "trending_score": float(node.get("votesCount") or 0),
+    }
+
+
+def _fetch_slice(
+    headers: dict,
+    posted_after: str,
+    posted_before: str,
+    budget: _Budget,
+    now_iso: str,
+) -> list[dict]:
+    """Follow endCursor through one time slice of the window."""
+    results = []
+    cursor = None
+    try:
+        for _ in range(MAX_PAGES_PER_SLICE):
+            first = budget.page_size()
+            if not first:
+                logger.warning(
+                    "Product Hunt complexity budget low (%s remaining, resets in %ss). "
+                    "Stopping slice %s early.",
+                    budget.remaining, budget.reset, posted_after,
+                )
+                break
+
+            payload = {
+                "query": PAGED_POSTS_QUERY,
+                "variables": {
+                    "postedAfter": posted_after,
+                    "postedBefore": posted_before,
+                    "first": first,
+                    "after": cursor,
+                },
+            }
+            try:
+                resp = requests.post(
+                    PH_GRAPHQL_URL, headers=headers, json=payload, timeout=20
+                )
+                budget.update(resp.headers)
+                resp.raise_for_status()
+                data = resp.json()
+            except Exception as exc:
+                logger.error("Product Hunt page fetch failed: %s", exc)
+                break
+
+            errors = data.get("errors")
+            if errors:
+                logger.error("Product Hunt GraphQL errors: %s", errors)
+                break
+
+            posts = (data.get("data") or {}).get("posts") or {}
+            for edge in posts.get("edges", []):
+                node = edge.get("node")
+                if node and isinstance(node, dict):
+                    results.append(_to_item(node, now_iso))
+
+            page_info = posts.get("pageInfo") or {}
+            cursor = page_info.get("endCursor")
+            if not page_info.get("hasNextPage") or not cursor:
+                break
+    finally:
+        budget.finish_slice()
+    return results
+
+
+def iter_posts(token: str):
+    """
+    Yield mapped items for the whole window as each time slice completes.
+    Slices run concurrently; pages within a slice follow the cursor.
+    """
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+    }
+    now = datetime.now(timezone.utc)
+    now_iso = now.isoformat()
+    start = now - timedelta(days=WINDOW_DAYS)
+    step = (now - start) / WINDOW_SLICES
+    bounds = [
+        ((start + step * i).isoformat(), (start + step * (i + 1)).isoformat())
+        for i in range(WINDOW_SLICES)
+    ]
+
+    budget = _Budget(WINDOW_SLICES)
+    seen: set[str] = set()
+    with ThreadPoolExecutor(max_workers=WINDOW_SLICES) as pool:
+        futures = [
+            pool.submit(_fetch_slice, headers, after, before, budget, now_iso)
+            for after, before in bounds
+        ]
+        for future in as_completed(futures):
+            for item in future.result():
+                if item["id"] in seen:
+                    continue
+                seen.add(item["id"])
+                yield item
+
+
 def fetch() -> list[dict]:
+    if os.environ.get("PH_FETCH_MODE", "paginated") != "paginated":
+        return fetch_single()
+
+    token = _get_token()
+    if not token:
+        logger.warning(
+            "No Product Hunt token found (PRODUCT_HUNT_TOKEN env var). Skipping."
+        )
+        return []
+
+    results = list(iter_posts(token))
+    logger.info("Product Hunt: fetched %d posts", len(results))
+    return results
+
+
+def fetch_single() -> list[dict]:
     token = _get_token()
     if not token:
         logger.warning(
@@ -107,34 +338,7 @@ def fetch() -> list[dict]:
         node = edge.get("node")
         if not node or not isinstance(node, dict):
             continue
-        topic_slugs = [
-            t.get("node", {}).get("slug", "")
-            for t in node.get("topics", {}).get("edges", [])
-            if t.get("node", {}).get("slug")
-        ]
-        thumbnail_url = None
-        if node.get("thumbnail"):
-            thumbnail_url = node["thumbnail"].get("url")
-
-        results.append(
-            {
-                "id": f"ph_{node['id']}",
-                "source": "producthunt",
-                "title": node.get("name", ""),
-                "description": node.get("tagline", ""),
-                "url": node.get("url", ""),
-                "author": node.get("user", {}).get("username", ""),
-                "stars": None,
-                "score": node.get("votesCount", 0),
-                "tags": topic_slugs,
-                "language": None,
-                "created_at": node.get("createdAt", ""),
-                "fetched_at": now_iso,
-                "thumbnail_url": thumbnail_url,
-                "is_new": True,
-                "trending_score": float(node.get("votesCount") or 0),
-            }
-        )
+        results.append(_to_item(node, now_iso))
 
     logger.info("Product Hunt: fetched %d posts", len(results))
     return results
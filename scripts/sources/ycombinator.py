@@ -6,9 +6,6 @@ Filters for AI/ML companies from recent batches.
 import logging
 from datetime import datetime, timezone
 
-import sys
-import pathlib
-sys.path.insert(0, str(pathlib.Path(__file__).parent.parent))
 from utils import safe_get
 
 logger = logging.getLogger(__name__)
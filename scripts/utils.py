@@ -27,8 +27,11 @@ def rate_limit_sleep(seconds: float) -> None:
     retry=retry_if_exception_type((requests.HTTPError, requests.Timeout)),
     reraise=True,
 )
-def safe_get(url: str, headers: dict = None, params: dict = None) -> dict:
-    """GET with automatic retry + exponential backoff. Raises after 3 attempts."""
+def safe_get_response(url: str, headers: dict = None, params: dict = None) -> requests.Response:
+    """
+    GET with automatic retry + exponential backoff. Raises after 3 attempts.
+    Returns the response so callers can read rate-limit headers.
+    """
     resp = requests.get(url, headers=headers, params=params, timeout=15)
     if resp.status_code == 429:
         # Cap Retry-After to prevent a malicious/misbehaving API from
@@ -43,34 +46,10 @@ def safe_get(url: str, headers: dict = None, params: dict = None) -> dict:
         time.sleep(retry_after)
         resp.raise_for_status()
     resp.raise_for_status()
-    return resp.json()
+    return resp
 
 
-def check_github_rate_limit(token: str) -> int:
-    """
-    Returns remaining GitHub Search API calls.
-    Sleeps until reset if remaining < 50.
-    """
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Accept": "application/vnd.github+json",
-    }
-    try:
-        data = requests.get(
-            "https://api.github.com/rate_limit", headers=headers, timeout=10
-        ).json()
-        remaining = data["resources"]["search"]["remaining"]
-        reset_at = data["resources"]["search"]["reset"]
-        if remaining < 50:
-            sleep_seconds = max(0, reset_at - time.time()) + 5
-            logger.warning(
-                "GitHub rate limit low (%d remaining). Sleeping %.0fs",
-                remaining,
-                sleep_seconds,
-            )
-            time.sleep(sleep_seconds)
-        logger.info("GitHub Search API: %d requests remaining", remaining)
-        return remaining
-    except Exception as exc:
-        logger.warning("Could not check GitHub rate limit: %s", exc)
-        return 100  # assume ok
+def safe_get(url: str, headers: dict = None, params: dict = None) -> dict:
+    """GET with automatic retry + exponential backoff. Raises after 3 attempts."""
+    return safe_get_response(url, headers=headers, params=params).json()
+